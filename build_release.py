@@ -56,7 +56,18 @@ def build_full_release(source_dir, project_root):
         "main.py", 
         "bounding_box_setup.py", 
         "fps_tracker.py", 
+        "presentmon_parser.py",
+        "credits_locator.py",
+        "digit_recognizer.py",
+        "screen_capture.py",
+        "scan_reader.py",
         "log_reader.py",
+        "file_notifier.py",
+        "log_session.py",
+        "event_bus.py",
+        "counter_timeline.py",
+        "log_recording.py",
+        "log_replay.py",
         "gui_components.py",
         "settings_dialog.py",
         "tracker.py",
@@ -126,7 +137,8 @@ def build_update_package(source_dir, project_root):
 
     # 2. Copy Scripts and Binaries from Source to LECTA_SCRIPTS
     script_files = [
-        "main.py", "bounding_box_setup.py", "fps_tracker.py", "log_reader.py",
+        "main.py", "bounding_box_setup.py", "fps_tracker.py", "presentmon_parser.py", "credits_locator.py", "digit_recognizer.py", "screen_capture.py", "scan_reader.py", "log_reader.py", "file_notifier.py",
+        "log_session.py", "log_replay.py", "event_bus.py", "counter_timeline.py", "log_recording.py",
         "gui_components.py", "settings_dialog.py", "tracker.py",
         "PresentMon.exe", "requirements.txt",
         "Background.png", "Credits.png"
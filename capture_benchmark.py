@@ -0,0 +1,94 @@
+import json
+import time
+import argparse
+import tracemalloc
+
+import cv2 as cv
+import numpy as np
+
+from screen_capture import ScreenCapture, ReplaySource
+
+# ==========================================
+# File-backed desktop
+# ==========================================
+def synthetic_desktop(width=1920, height=1080, seed=1):
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 60, size=(height, width, 4), dtype=np.uint8)
+    image[:, :, 3] = 255
+    return image
+
+def default_regions(width=1920, height=1080):
+    """Scan area, five credit boxes and the kills box at the tracker's default proportions."""
+    scan = (int(width * 0.3), int(height * 0.1), int(width * 0.6), int(height * 0.6))
+    credits = [(scan[0] + 30 + i * 110, scan[1] + 120, scan[0] + 130 + i * 110, scan[1] + 150) for i in range(5)]
+    kills = (scan[0] + 30, scan[1] + 220, scan[0] + 230, scan[1] + 250)
+    return scan, credits, kills
+
+def regions_from_config(path):
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return tuple(data['scan_area']), [tuple(b) for b in data['credit_positions']], tuple(data['kills']) if 'kills' in data else None
+
+# ==========================================
+# Scan capture paths
+# ==========================================
+def per_region_scan(source, scan, credits, kills):
+    """The old path: a separate grab plus np.array copy per region, fresh gray images."""
+    bboxes = [scan, credits[0]] + ([kills] if kills else [])
+    grays = []
+    for left, top, right, lower in bboxes:
+        im = np.array(source.grab(left, top, right - left, lower - top))
+        grays.append(cv.cvtColor(im, cv.COLOR_BGRA2GRAY))
+    return grays
+
+def session_scan(capture, scan, credits, kills):
+    """One grab of the union into a reused buffer, views per region, gray into reused buffers."""
+    regions = [scan] + credits + ([kills] if kills else [])
+    views = capture.grab_regions(regions)
+    grays = [capture.to_gray(views[scan], "label1"), capture.to_gray(views[credits[0]], "credits")]
+    if kills:
+        grays.append(capture.to_gray(views[kills], "kills"))
+    return grays
+
+def measure(fn, repeats):
+    fn() # Warm up (buffer allocation)
+    best = float('inf')
+    for _ in range(5):
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / repeats)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-scan capture cost of separate grabs vs. the persistent capture session, on a replayed desktop")
+    parser.add_argument("--screenshot", help="Setup screenshot to serve as the desktop (setup_screenshot_solo.png)")
+    parser.add_argument("--config", help="Bounding box config with the scan regions (bbox_config_solo.json)")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    image = cv.imread(args.screenshot, cv.IMREAD_UNCHANGED) if args.screenshot else synthetic_desktop()
+    if image is None:
+        print(f"[Bench] Could not read {args.screenshot}")
+        return
+    source = ReplaySource([image])
+    scan, credits, kills = regions_from_config(args.config) if args.config else default_regions(image.shape[1], image.shape[0])
+    capture = ScreenCapture(source)
+
+    reference = per_region_scan(source, scan, credits, kills)
+    result = session_scan(capture, scan, credits, kills)
+    same = all(np.array_equal(a, b) for a, b in zip(reference, result))
+    print(f"[Bench] desktop {image.shape[1]}x{image.shape[0]}, {len(credits)} credit boxes, kills box: {kills is not None}, same pixels: {same}")
+
+    for name, fn in (("separate grabs", lambda: per_region_scan(source, scan, credits, kills)),
+                     ("capture session", lambda: session_scan(capture, scan, credits, kills))):
+        secs, peak = measure(fn, args.repeats)
+        print(f"[Bench] {name:<16} {secs * 1e6:>8.1f} us/scan, {peak / 1024:>7.0f} KB allocated per scan")
+    print("[Bench] The replayed desktop has no per-call mss setup cost, which the separate grabs also paid on Windows.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import csv
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+SAMPLE = struct.Struct("<diiii") # Engine time, live, spawned, ally_live, kills
+
+class CounterTimeline:
+    """Every Live/Spawned/AllyLive change from EE.log, packed into one growable buffer.
+
+    One sample costs 24 bytes (a double plus four 32-bit ints), so even a multi-hour run
+    with hundreds of thousands of spawns stays at a few MB. Times are engine seconds and
+    keep increasing across game restarts (see add_time_offset).
+    """
+    def __init__(self):
+        # One bytearray += per sample: the reader thread appends a whole sample in one step,
+        # so other threads never see a half written one
+        self.samples = bytearray()
+        self.time = _SampleTimes(self)
+        self.time_offset = 0.0
+        self._last = None # Counters of the newest sample
+
+    def __len__(self):
+        return len(self.samples) // SAMPLE.size
+
+    def append(self, engine_time, live, spawned, ally_live, kills=0):
+        """Records a sample if any counter differs from the previous one."""
+        counters = (live, spawned, ally_live, kills)
+        if counters == self._last:
+            return
+        self._last = counters
+        self.samples += SAMPLE.pack(engine_time + self.time_offset, live, spawned, ally_live, kills)
+
+    def add_time_offset(self, last_engine_time):
+        """Called when EE.log restarts, so the engine clock starting over does not go back in time."""
+        self.time_offset += last_engine_time
+
+    def sample(self, i):
+        """(time, live, spawned, ally_live, kills) of sample i."""
+        return SAMPLE.unpack_from(self.samples, i * SAMPLE.size)
+
+    def range(self, start=None, end=None):
+        """Returns the (time, live, spawned, ally_live, kills) samples with start <= time <= end."""
+        n = len(self)
+        lo = 0 if start is None else bisect_left(self.time, start, 0, n)
+        hi = n if end is None else bisect_right(self.time, end, 0, n)
+        return list(SAMPLE.iter_unpack(self.samples[lo * SAMPLE.size:hi * SAMPLE.size]))
+
+    def last_before(self, t):
+        """Index of the last sample at or before time t, or -1."""
+        return bisect_right(self.time, t, 0, len(self)) - 1
+
+    def kills_at(self, t, default=0):
+        """Kill count as of time t, or default if there is no sample that early."""
+        i = self.last_before(t)
+        return self.sample(i)[4] if i >= 0 else default
+
+    def nbytes(self):
+        return len(self.samples)
+
+    def to_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Engine_Time", "Live", "Spawned", "AllyLive", "Kills"])
+            for sample in self.range():
+                writer.writerow((f"{sample[0]:.3f}",) + sample[1:])
+
+class _SampleTimes:
+    """The sample times of a CounterTimeline as a sequence bisect can search in place (index and len only)."""
+    def __init__(self, timeline):
+        self.timeline = timeline
+
+    def __len__(self):
+        return len(self.timeline)
+
+    def __getitem__(self, i):
+        return self.timeline.sample(i)[0]
+
+class SpawnComposition:
+    """Spawn times per enemy type, parsed from the agent paths of OnAgentCreated lines.
+
+    Keys are interned type names ("CorruptedLancer"), values are arrays of engine times
+    (8 bytes per spawn), so counts for any time window are two bisects per type.
+    Times use the same clock as CounterTimeline (LogReader.engine_now()).
+    """
+    def __init__(self):
+        self.times = {}
+
+    def add(self, agent_type, engine_time):
+        self.appender(agent_type)(engine_time)
+
+    def appender(self, agent_type):
+        """The bound append of agent_type's time array, so the reader can skip the dict lookup per spawn."""
+        times = self.times.get(agent_type)
+        if times is None:
+            times = self.times[agent_type] = array('d')
+        return times.append
+
+    def total(self):
+        return sum(len(times) for times in list(self.times.values()))
+
+    def counts(self, start=None, end=None):
+        """Returns {type: spawns with start <= time <= end}, most spawned first."""
+        result = {}
+        for agent_type, times in list(self.times.items()):
+            n = len(times)
+            lo = 0 if start is None else bisect_left(times, start, 0, n)
+            hi = n if end is None else bisect_right(times, end, 0, n)
+            if hi > lo:
+                result[agent_type] = hi - lo
+        return dict(sorted(result.items(), key=lambda item: item[1], reverse=True))
+
+    def binned(self, start, end, bin_seconds=60):
+        """Spawns per type in consecutive bins from start to end. Returns (bin start offsets in seconds, {type: [count per bin]})."""
+        num_bins = max(1, int((end - start) // bin_seconds) + 1)
+        offsets = [i * bin_seconds for i in range(num_bins)]
+        series = {}
+        for agent_type in self.counts(start, end):
+            times = self.times[agent_type]
+            n = len(times)
+            series[agent_type] = [bisect_left(times, start + o + bin_seconds, 0, n) - bisect_left(times, start + o, 0, n) for o in offsets]
+        return offsets, series
+
+    def to_csv(self, path, start, end, bin_seconds=60):
+        """One row per bin (Minute, Total, one column per type) followed by a per-type summary."""
+        offsets, series = self.binned(start, end, bin_seconds)
+        types = list(series)
+        totals = self.counts(start, end)
+        total = sum(totals.values())
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Minute", "Total"] + types)
+            for i, offset in enumerate(offsets):
+                row = [series[t][i] for t in types]
+                writer.writerow([f"{offset / 60:.2f}", sum(row)] + row)
+            writer.writerow([])
+            writer.writerow(["Type", "Spawned", "Share_%"])
+            for agent_type, count in totals.items():
+                writer.writerow([agent_type, count, f"{count / total * 100:.1f}"])
@@ -0,0 +1,66 @@
+import cv2 as cv
+
+MATCH_THRESHOLD = 0.8 # Normalized correlation a cached label must reach to count as found
+SEARCH_MARGIN = 24 # Pixels around the cached position that are searched, the menu can shift slightly
+
+class CreditsLabelLocator:
+    """Finds the "Credits" label again without OCR once it has been found once.
+
+    The first successful OCR detection in a scan area stores the grayscale label as a template
+    together with its position. Later scans match that template in a small neighborhood of the
+    old position (cv.matchTemplate, a few ms) and only fall back to full OCR on a mismatch.
+    """
+    def __init__(self, threshold=MATCH_THRESHOLD, margin=SEARCH_MARGIN):
+        self.threshold = threshold
+        self.margin = margin
+        self.templates = {} # Scan area -> (template, (x, y, w, h))
+        self.hits = 0
+        self.misses = 0 # Scans that needed full OCR, including the first one
+        self.last_score = 0.0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def locate(self, area, im_gray):
+        """Returns (x, y, w, h) of the label in im_gray if the cached template matches, else None."""
+        entry = self.templates.get(area)
+        self.last_score = 0.0
+        if entry is None:
+            self.misses += 1
+            return None
+        template, (x, y, w, h) = entry
+        x0, y0 = max(0, x - self.margin), max(0, y - self.margin)
+        region = im_gray[y0:y + h + self.margin, x0:x + w + self.margin]
+        if region.shape[0] < h or region.shape[1] < w:
+            self.misses += 1
+            return None
+
+        result = cv.matchTemplate(region, template, cv.TM_CCOEFF_NORMED)
+        _, score, _, (dx, dy) = cv.minMaxLoc(result)
+        self.last_score = score
+        if score < self.threshold: # Menu closed or moved, a blank region scores 0
+            self.misses += 1
+            return None
+        self.hits += 1
+        return (x0 + dx, y0 + dy, w, h)
+
+    def learn(self, area, im_gray, coords):
+        """Caches the label found by OCR at coords as the template for this scan area."""
+        x, y, w, h = coords
+        x, y = max(0, x), max(0, y)
+        template = im_gray[y:y + h, x:x + w].copy()
+        if template.size == 0 or template.std() == 0:
+            return # Flat crop, nothing to match against
+        self.templates[area] = (template, (x, y, template.shape[1], template.shape[0]))
+
+    def forget(self, area=None):
+        if area is None:
+            self.templates.clear()
+        else:
+            self.templates.pop(area, None)
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"{self.hits} template hits, {self.misses} full OCR ({rate:.0f}% hit rate)"
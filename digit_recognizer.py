@@ -0,0 +1,168 @@
+import os
+import cv2 as cv
+import numpy as np
+
+GLYPH_WIDTH = 16 # Glyphs are scaled to this box keeping their aspect ratio, so "1" stays narrow
+GLYPH_HEIGHT = 24
+MIN_CONFIDENCE = 0.85 # Correlation every digit must reach, otherwise EasyOCR reads the box
+MIN_MARGIN = 0.04 # Best digit must beat the second best by this much
+MAX_SAMPLES = 6 # Templates kept per digit (slight size/antialiasing variants)
+NEW_SAMPLE_BELOW = 0.97 # A learned glyph only becomes a new sample if no existing one is this similar
+MIN_COMPONENT_AREA = 4 # Pixels, smaller blobs are noise
+MIN_DIGIT_HEIGHT = 0.6 # Fraction of the tallest glyph, shorter blobs are commas and dots
+LEARN_MIN_CONFIDENCE = 0.6 # EasyOCR confidence a read needs before its glyphs are learned
+
+def binarize(im):
+    """Same preprocessing as the OCR path: gray, then white text on black."""
+    if im.ndim == 3:
+        im = cv.cvtColor(im, cv.COLOR_BGRA2GRAY if im.shape[2] == 4 else cv.COLOR_BGR2GRAY)
+    _, im_thresh = cv.threshold(im, 150, 255, cv.THRESH_BINARY)
+    return im_thresh
+
+def text_region(im_thresh, pad=4):
+    """[x_min, x_max, y_min, y_max] around the white pixels (EasyOCR's horizontal_list format), None if blank."""
+    points = cv.findNonZero(im_thresh)
+    if points is None:
+        return None
+    x, y, w, h = cv.boundingRect(points)
+    height, width = im_thresh.shape
+    return [max(0, x - pad), min(width, x + w + pad), max(0, y - pad), min(height, y + h + pad)]
+
+def scan_text(scan):
+    """Digits of an EasyOCR result, segments joined (fixes "1 000" being split) and separators removed."""
+    return "".join(x[1] for x in scan).replace(",", "").replace(" ", "")
+
+class DigitRecognizer:
+    """Reads the credit and kill numbers by correlating each glyph with learned digit templates.
+
+    The numbers use one fixed font on a dark background, so a thresholded box splits cleanly into
+    one connected component per digit. Templates are learned from numbers EasyOCR read successfully;
+    read() returns None whenever it is unsure, so EasyOCR stays the fallback.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.samples = {} # Digit character -> array of normalized glyphs, shape (n, GLYPH_HEIGHT * GLYPH_WIDTH)
+        self.changed = False
+        self.hits = 0
+        self.fallbacks = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __bool__(self):
+        return bool(self.samples)
+
+    def reset_stats(self):
+        self.hits = 0
+        self.fallbacks = 0
+
+    def segment(self, im_thresh):
+        """Bounding boxes (x, y, w, h) of the digits in a binarized image, left to right."""
+        count, _, stats, _ = cv.connectedComponentsWithStats(im_thresh, connectivity=8)
+        boxes = sorted(tuple(int(v) for v in stats[i, :4]) for i in range(1, count) if stats[i, 4] >= MIN_COMPONENT_AREA)
+
+        # Glyphs broken by the threshold come out as pieces on top of each other, join them
+        merged = []
+        for x, y, w, h in boxes:
+            if merged:
+                px, py, pw, ph = merged[-1]
+                if x < px + pw - 1:
+                    nx, ny = min(px, x), min(py, y)
+                    merged[-1] = (nx, ny, max(px + pw, x + w) - nx, max(py + ph, y + h) - ny)
+                    continue
+            merged.append((x, y, w, h))
+        if not merged:
+            return []
+        tallest = max(h for _, _, _, h in merged)
+        return [box for box in merged if box[3] >= tallest * MIN_DIGIT_HEIGHT]
+
+    @staticmethod
+    def _normalize(glyph):
+        """Scales a glyph crop into the fixed box and returns it as a zero-mean, unit-length vector."""
+        h, w = glyph.shape
+        scale = GLYPH_HEIGHT / h
+        new_w = max(1, min(GLYPH_WIDTH, int(round(w * scale))))
+        scaled = cv.resize(glyph, (new_w, GLYPH_HEIGHT), interpolation=cv.INTER_AREA)
+        canvas = np.zeros((GLYPH_HEIGHT, GLYPH_WIDTH), dtype=np.float32)
+        left = (GLYPH_WIDTH - new_w) // 2
+        canvas[:, left:left + new_w] = scaled
+        vec = canvas.ravel()
+        vec -= vec.mean()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _glyphs(self, im_thresh):
+        return [self._normalize(im_thresh[y:y + h, x:x + w]) for x, y, w, h in self.segment(im_thresh)]
+
+    def classify(self, im_thresh):
+        """Returns (text, per-digit confidences), text is None if nothing could be segmented."""
+        glyphs = self._glyphs(im_thresh)
+        if not glyphs or not self.samples:
+            return None, []
+        digits = list(self.samples)
+        # Best correlation of every glyph with every digit's samples, one matrix product per digit
+        stacked = np.stack(glyphs)
+        scores = np.stack([(stacked @ self.samples[d].T).max(axis=1) for d in digits], axis=1)
+        text = []
+        confidences = []
+        for row in scores:
+            order = np.argsort(row)[::-1]
+            best = row[order[0]]
+            margin = best - row[order[1]] if len(order) > 1 else best
+            text.append(digits[order[0]])
+            # Close to two digits at once: report the margin instead, which is far below MIN_CONFIDENCE
+            confidences.append(float(best) if margin >= MIN_MARGIN else float(margin))
+        return "".join(text), confidences
+
+    def read(self, im_thresh):
+        """Returns (number, confidence) if every digit is recognized confidently, else None."""
+        text, confidences = self.classify(im_thresh)
+        if text is None or min(confidences) < MIN_CONFIDENCE:
+            self.fallbacks += 1
+            return None
+        self.hits += 1
+        return int(text), min(confidences)
+
+    def learn(self, im_thresh, number):
+        """Adds the glyphs of a box whose value is known. Returns False if the segmentation doesn't fit the number."""
+        text = str(number)
+        glyphs = self._glyphs(im_thresh)
+        if len(glyphs) != len(text):
+            return False
+        for char, glyph in zip(text, glyphs):
+            existing = self.samples.get(char)
+            if existing is None:
+                self.samples[char] = glyph[None, :]
+            elif len(existing) < MAX_SAMPLES and (existing @ glyph).max() < NEW_SAMPLE_BELOW:
+                self.samples[char] = np.vstack((existing, glyph))
+            else:
+                continue
+            self.changed = True
+        return True
+
+    def load(self, path):
+        try:
+            with np.load(path) as data:
+                samples = {d: data[d] for d in data.files}
+        except Exception as e:
+            print(f"[Digits] Could not load digit templates: {e}")
+            return
+        if any(s.ndim != 2 or s.shape[1] != GLYPH_WIDTH * GLYPH_HEIGHT for s in samples.values()):
+            print("[Digits] Digit templates have an old glyph size, learning them again.")
+            return
+        self.samples = samples
+
+    def save(self, path=None):
+        path = path or self.path
+        if not path or not self.changed:
+            return
+        try:
+            np.savez_compressed(path, **self.samples)
+            self.changed = False
+        except Exception as e:
+            print(f"[Digits] Could not save digit templates: {e}")
+
+    def summary(self):
+        total = self.hits + self.fallbacks
+        rate = self.hits / total * 100 if total else 0.0
+        known = "".join(sorted(self.samples))
+        return f"{self.hits} template reads, {self.fallbacks} EasyOCR fallbacks ({rate:.0f}% fast path), digits known: {known or 'none'}"
@@ -0,0 +1,127 @@
+import time
+import random
+import argparse
+
+from log_reader import ACOLYTE_MAP
+
+# ==========================================
+# Synthetic EE.log traffic
+# ==========================================
+NOISE_LINES = [
+    "Sys [Info]: Streaming: loaded /Lotus/Levels/Proc/Orokin/OrokinTowerDerelict",
+    "Net [Info]: Sending heartbeat to region server (ping 38ms)",
+    "Net [Info]: Replication count by type: 412 (pending: 3)",
+    "Game [Info]: AI: NavMesh rebuild took 0.21ms",
+    "Sys [Warning]: Texture streaming budget exceeded by 12MB",
+    "Script [Info]: HudRedux.lua: Updating squad member health bars",
+    "Sound [Info]: Voice limit reached, stealing /Lotus/Sounds/Weapons/Nukor/NukorFire",
+]
+AGENT_TYPES = ["/Npc/Lancer", "/Npc/CorruptedLancer", "/Npc/CorruptedHeavyGunner", "/Npc/CorruptedBombard", "/Npc/OrokinDrone", "/Npc/CorruptedButcher"]
+TAUNT_PATH = "/Lotus/Sounds/Dialog/Taunts/Acolytes/{tag}Acolyte{kind}"
+
+class SyntheticEELog:
+    """Produces realistic EE.log lines and keeps the ground truth of what a parser should see."""
+    def __init__(self, seed=1, agent_ratio=0.3, acolyte_ratio=0.0005, scream_ratio=0.0002, allies=1, max_live=60):
+        self.rng = random.Random(seed)
+        self.agent_ratio = agent_ratio
+        self.acolyte_ratio = acolyte_ratio
+        self.scream_ratio = scream_ratio
+        self.max_live = max_live
+        self.allies_max = allies
+
+        # Ground truth
+        self.live = 0
+        self.spawned = 0
+        self.ally_live = allies
+        self.taunts = 0
+        self.screams = 0
+        self.deaths = 0
+        self.lines = 0
+        self.active_acolyte = None
+
+    def line(self, engine_time):
+        """Returns the next line (without newline) stamped with the given engine time."""
+        rng = self.rng
+        self.lines += 1
+        r = rng.random()
+        if r < self.acolyte_ratio:
+            if self.active_acolyte is None:
+                self.active_acolyte = rng.choice(list(ACOLYTE_MAP))
+                self.taunts += 1
+                return f"{engine_time:.3f} Snd [Info]: Playing dialog {TAUNT_PATH.format(tag=self.active_acolyte, kind='Taunt')}"
+            tag, self.active_acolyte = self.active_acolyte, None
+            self.deaths += 1
+            return f"{engine_time:.3f} Snd [Info]: Playing dialog {TAUNT_PATH.format(tag=tag, kind='Defeat')}"
+        r -= self.acolyte_ratio
+        if r < self.scream_ratio:
+            self.screams += 1
+            return f"{engine_time:.3f} Game [Info]: Created /Lotus/Types/Enemies/Acolytes/ScreamDebuffAttachProj"
+        r -= self.scream_ratio
+        if r < self.agent_ratio:
+            self.spawned += 1
+            self.live = max(0, min(self.live + rng.choice((1, 1, 0, -1)), self.max_live))
+            if rng.random() < 0.01:
+                self.ally_live = rng.randint(0, self.allies_max)
+            # Agent paths end in a per-instance number, like the game's ("/Npc/CorruptedLancer1234")
+            return (f"{engine_time:.3f} AI [Info]: OnAgentCreated {rng.choice(AGENT_TYPES)}{self.spawned} "
+                    f"Live {self.live} Spawned {self.spawned} Ticking {self.live} AllyLive {self.ally_live}")
+        return f"{engine_time:.3f} {rng.choice(NOISE_LINES)}"
+
+    def truth(self):
+        return {"live": self.live, "spawned": self.spawned, "ally_live": self.ally_live,
+                "taunts": self.taunts, "screams": self.screams, "deaths": self.deaths, "lines": self.lines}
+
+def write_synthetic_log(path, num_lines, agent_ratio=0.3, seed=1):
+    """Writes a synthetic EE.log in one go. Returns (live, spawned) of the last counter line."""
+    gen = SyntheticEELog(seed=seed, agent_ratio=agent_ratio)
+    engine_time = 100.0
+    with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+        for _ in range(num_lines):
+            engine_time += gen.rng.uniform(0.0005, 0.005)
+            f.write(gen.line(engine_time) + "\n")
+    return gen.live, gen.spawned
+
+def stream_synthetic_log(path, rate, seconds, gen=None, batch_interval=0.01, on_batch=None, should_stop=None):
+    """Appends lines to path at 'rate' lines/sec for 'seconds', like the game writing EE.log.
+
+    Lines are written in small batches every batch_interval seconds. on_batch(t_written, end_offset)
+    is called after each flushed batch. Returns the generator with its ground truth.
+    """
+    gen = gen or SyntheticEELog()
+    start = time.perf_counter()
+    written = 0
+    with open(path, 'a', encoding='utf-8', newline='\r\n') as f:
+        while True:
+            elapsed = time.perf_counter() - start
+            if elapsed >= seconds or (should_stop and should_stop()):
+                break
+            due = int(elapsed * rate) - written
+            if due > 0:
+                engine_time = 100.0 + elapsed
+                f.write("".join(gen.line(engine_time) + "\n" for _ in range(due)))
+                f.flush()
+                written += due
+                if on_batch:
+                    on_batch(time.perf_counter(), f.tell())
+            time.sleep(batch_interval)
+    return gen
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic EE.log traffic, either all at once or live at a fixed line rate.")
+    parser.add_argument("out", help="Output file")
+    parser.add_argument("--lines", type=int, default=100_000, help="Lines to write in one go")
+    parser.add_argument("--rate", type=int, help="Stream at this many lines/sec instead (appends)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Duration when streaming")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.rate:
+        print(f"[Generator] Streaming {args.rate} lines/s to {args.out} for {args.seconds}s...")
+        gen = stream_synthetic_log(args.out, args.rate, args.seconds, SyntheticEELog(seed=args.seed))
+        print(f"[Generator] Done: {gen.truth()}")
+    else:
+        live, spawned = write_synthetic_log(args.out, args.lines, seed=args.seed)
+        print(f"[Generator] Wrote {args.lines} lines to {args.out} (Live {live}, Spawned {spawned})")
+
+if __name__ == "__main__":
+    main()
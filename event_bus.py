@@ -0,0 +1,71 @@
+import time
+import threading
+from collections import deque, namedtuple
+
+# Event kinds published by LogReader
+EVENT_ACOLYTE = "acolyte" # data: (name, duration)
+EVENT_ALLIES = "allies"   # data: new AllyLive count
+EVENT_GENERAL = "general" # data: text for the Event column ("Violence Dead", "Log Reset", ...)
+EVENT_MISSION_START = "mission_start" # data: mission name ("" if the marker had none)
+EVENT_MISSION_END = "mission_end"     # data: (mission name, kills counted in that mission)
+
+LogEvent = namedtuple("LogEvent", "kind data engine_time created")
+
+class EventBus:
+    """Thread-safe bounded event queue with push notifications.
+
+    The producer thread publishes events. Consumers either drain() them (from any thread),
+    wait() on the condition, or subscribe a callback that is invoked right after each publish.
+    Callbacks run on the producer thread, so GUI code should subscribe a Qt signal's emit.
+    """
+    def __init__(self, maxlen=1024):
+        self.queue = deque(maxlen=maxlen)
+        self.cond = threading.Condition()
+        self.subscribers = []
+        self.published = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=2000) # Seconds from publish to drain
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def publish(self, kind, data, engine_time=0.0):
+        event = LogEvent(kind, data, engine_time, time.perf_counter())
+        with self.cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1 # Oldest event is pushed out
+            self.queue.append(event)
+            self.published += 1
+            self.cond.notify_all()
+        for callback in list(self.subscribers):
+            try:
+                callback()
+            except Exception as e:
+                print(f"[EventBus] Subscriber error: {e}")
+
+    def drain(self):
+        """Returns all pending events in publish order."""
+        with self.cond:
+            if not self.queue:
+                return []
+            events = list(self.queue)
+            self.queue.clear()
+        now = time.perf_counter()
+        self.latencies.extend(now - e.created for e in events)
+        return events
+
+    def wait(self, timeout=None):
+        """Blocks until at least one event is pending. Returns True if there is one."""
+        with self.cond:
+            return self.cond.wait_for(lambda: len(self.queue) > 0, timeout)
+
+    def latency_stats(self):
+        """Returns (count, median_ms, max_ms) of the recent publish-to-delivery latencies."""
+        if not self.latencies:
+            return 0, 0.0, 0.0
+        ordered = sorted(self.latencies)
+        return len(ordered), ordered[len(ordered) // 2] * 1000, ordered[-1] * 1000
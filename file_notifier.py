@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+_EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len
+
+class PollingNotifier:
+    """Fallback notifier. Simply sleeps for a fixed interval, like the old reader loop did."""
+    name = "poll"
+
+    def __init__(self, path, interval=0.01):
+        self.path = path
+        self.interval = interval
+
+    def wait(self, timeout):
+        """Blocks until the file may have changed. Returns True if the caller should re-read."""
+        time.sleep(min(timeout, self.interval))
+        return True
+
+    def close(self):
+        pass
+
+class InotifyNotifier:
+    """Wakes up only when the kernel reports a change to the watched file (Linux)."""
+    name = "inotify"
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.file_name = os.path.basename(self.path).encode()
+        self.fd = -1
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+
+        # Watch the directory, not the file, so a truncated or replaced EE.log still wakes us up
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        directory = os.path.dirname(self.path).encode()
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            err = ctypes.get_errno()
+            self.close()
+            raise OSError(err, f"inotify_add_watch failed for {directory!r}")
+
+    def wait(self, timeout):
+        """Blocks until the watched file changes or the timeout expires. Returns True on change."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain():
+                return True
+
+    def _drain(self):
+        """Reads all pending events. Returns True if any of them concerns our file."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return relevant
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos:pos + name_len].rstrip(b"\0")
+                pos += name_len
+                if name == self.file_name or mask & IN_Q_OVERFLOW:
+                    relevant = True
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+def create_notifier(path):
+    """Returns the best available notifier for this platform, falling back to polling."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyNotifier(path)
+        except (OSError, AttributeError) as e:
+            print(f"[LogReader] inotify unavailable ({e}). Falling back to polling.")
+    return PollingNotifier(path)
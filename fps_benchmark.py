@@ -0,0 +1,170 @@
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from presentmon_parser import PresentMonParser
+from fps_tracker import FPSTracker, CsvReplaySource, FPS_STATS_WINDOW, HITCH_MIN_MS, HITCH_WARMUP_FRAMES
+
+# ==========================================
+# Synthetic PresentMon output
+# ==========================================
+PRESENTMON_HEADER = ("Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,Dropped,"
+                     "TimeInSeconds,msInPresentAPI,msBetweenPresents,AllowsTearing,PresentMode,"
+                     "msUntilRenderComplete,msUntilDisplayed,msBetweenDisplayChange")
+
+def write_synthetic_presentmon(path, num_frames, fps=144, hitch_ratio=0.002, seed=1):
+    """Writes a PresentMon --output_stdout style CSV. Returns the list of frame times (ms) written."""
+    rng = random.Random(seed)
+    base = 1000.0 / fps
+    t = 0.0
+    frames = []
+    with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+        f.write(PRESENTMON_HEADER + "\n")
+        for _ in range(num_frames):
+            ms = base * rng.uniform(0.9, 1.1)
+            if rng.random() < hitch_ratio:
+                ms *= rng.uniform(4, 40) # Hitch
+            t += ms / 1000
+            frames.append(round(ms, 3))
+            f.write(f"Warframe.x64.exe,12345,0x000001F2A3B4C5D0,DXGI,0,0,0,{t:.6f},{rng.uniform(0.05, 0.3):.3f},"
+                    f"{ms:.3f},1,Hardware: Independent Flip,{ms * 0.6:.3f},{ms * 0.8:.3f},{ms:.3f}\n")
+    return frames
+
+# ==========================================
+# Parsers
+# ==========================================
+def legacy_parse(lines):
+    """The original per-line path: decode, strip, split, float."""
+    ms_idx = None
+    frames = []
+    for raw_line in lines:
+        line = raw_line.decode("utf-8", errors="ignore").strip()
+        if not line:
+            continue
+        parts = line.split(",")
+        if ms_idx is None:
+            for i, header in enumerate(parts):
+                if "msbetweenpresents" in header.lower():
+                    ms_idx = i
+                    break
+            continue
+        if ms_idx is not None and len(parts) > ms_idx:
+            try:
+                ms = float(parts[ms_idx])
+                if ms > 0:
+                    frames.append(ms)
+            except ValueError:
+                pass
+    return frames
+
+def chunked_parse(data, chunk_size):
+    parser = PresentMonParser()
+    frames = []
+    for pos in range(0, len(data), chunk_size):
+        frames.extend(parser.feed(data[pos:pos + chunk_size]))
+    return frames
+
+def best_of(fn, repeats):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def bench_parse(path, repeats, expected=None):
+    """Per-frame parse cost of the original line loop vs. the bytes-level parser at several read sizes."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    lines = data.splitlines(keepends=True) # What iterating the pipe yields
+
+    secs, reference = best_of(lambda: legacy_parse(lines), repeats)
+    print(f"[Bench] {'line split':<16} {secs * 1e9 / max(1, len(reference)):>7.0f} ns/frame  ({len(reference)} frames)")
+    for chunk_size in (4096, 65536):
+        secs, frames = best_of(lambda: chunked_parse(data, chunk_size), repeats)
+        verdict = "OK" if frames == reference else "MISMATCH"
+        print(f"[Bench] {f'bytes {chunk_size // 1024}KB reads':<16} {secs * 1e9 / max(1, len(frames)):>7.0f} ns/frame  ({len(frames)} frames) {verdict}")
+    if expected is not None:
+        print(f"[Bench] frame times match the generator: {reference == expected}")
+
+def reference_stats(frames, window=FPS_STATS_WINDOW):
+    """FPSTracker.get_frame_stats() computed the slow, obvious way, to check the tracker against."""
+    recent = []
+    elapsed = 0.0
+    for ms in reversed(frames):
+        elapsed += ms
+        if elapsed >= window * 1000.0 and recent:
+            break
+        recent.append(ms)
+    slowest = sorted(recent, reverse=True)
+    ordered = sorted(recent)
+    mid = len(ordered) // 2
+    median = ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    low_1 = slowest[:max(1, len(recent) // 100)]
+    low_01 = slowest[:max(1, len(recent) // 1000)]
+    return {
+        "avg_fps": int(round(1000.0 / (sum(recent) / len(recent)))),
+        "median_fps": int(round(1000.0 / median)),
+        "low_1_fps": int(round(1000.0 / (sum(low_1) / len(low_1)))),
+        "low_01_fps": int(round(1000.0 / (sum(low_01) / len(low_01)))),
+        "max_frametime_ms": round(slowest[0], 2),
+    }
+
+def reference_hitches(frames, threshold):
+    """Frames above threshold x the true median of the whole capture (the generator's frame rate is steady)."""
+    median = sorted(frames)[len(frames) // 2]
+    limit = max(HITCH_MIN_MS, median * threshold)
+    return [ms for ms in frames[HITCH_WARMUP_FRAMES:] if ms > limit]
+
+def bench_pipeline(path, speed, expected=None):
+    """Replays the CSV through FPSTracker (source, parser, ring buffer, statistics) and checks the result."""
+    tracker = FPSTracker(CsvReplaySource(path, speed))
+    t0 = time.perf_counter()
+    tracker.start()
+    if tracker.thread is None:
+        return
+    tracker.thread.join()
+    secs = time.perf_counter() - t0
+    frames = tracker.frames_total
+
+    t0 = time.perf_counter()
+    stats = tracker.get_frame_stats()
+    stats_ms = (time.perf_counter() - t0) * 1000
+    fps = tracker.get_fps()
+    hitches = tracker.pop_hitches()
+    median_ms = tracker.median_ms
+    tracker.stop()
+
+    print(f"[Bench] replay x{speed:g}: {frames} frames in {secs:.2f}s, {secs * 1e9 / max(1, frames):.0f} ns/frame, "
+          f"get_frame_stats {stats_ms:.2f} ms, get_fps {fps}")
+    print(f"[Bench] stats: {stats}")
+    print(f"[Bench] hitches: {len(hitches)} (x{tracker.hitch_threshold:g} median, running median estimate {median_ms:.2f} ms)")
+    if expected is not None:
+        reference = reference_stats(expected)
+        print(f"[Bench] stats match the reference: {stats == reference}" + ("" if stats == reference else f" (expected {reference})"))
+        found = [round(ms, 3) for _, ms, _ in hitches]
+        print(f"[Bench] hitches match the reference: {found == reference_hitches(expected, tracker.hitch_threshold)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="PresentMon CSV parsing benchmark on a synthetic or recorded capture")
+    parser.add_argument("--csv", help="Recorded PresentMon CSV (PresentMon.exe --output_file ...) instead of a synthetic one")
+    parser.add_argument("--frames", type=int, default=200_000, help="Frame count of the synthetic capture")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--speed", type=float, default=0, help="Replay speed through FPSTracker, 1 = real time, 0 = as fast as possible")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = None
+        path = args.csv
+        if not path:
+            path = os.path.join(tmp, "presentmon.csv")
+            expected = write_synthetic_presentmon(path, args.frames)
+        print(f"[Bench] PresentMon CSV: {os.path.basename(path)}, {os.path.getsize(path) / (1024 * 1024):.1f} MB")
+        bench_parse(path, args.repeats, expected)
+        bench_pipeline(path, args.speed, expected)
+
+if __name__ == "__main__":
+    main()
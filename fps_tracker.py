@@ -3,37 +3,51 @@ import threading
 import os
 import sys
 import time
+import numpy as np
 
-class FPSTracker:
-    def __init__(self):
-        self.base_dir = os.path.dirname(os.path.abspath(__file__))
-        self.presentmon_path = os.path.join(self.base_dir, "PresentMon.exe")
-        self.process_name = "Warframe.x64.exe"
-        self.proc = None
-        self.thread = None
-        self.running = False
-        self.frame_times = []
-        self.last_fps = 0
-        self.lock = threading.Lock()
+from presentmon_parser import PresentMonParser
 
-    def start(self):
-        if self.running:
-            return
+FRAME_BUFFER_SIZE = 16384 # Frame times kept, about 1 minute at 240 FPS
+FPS_STATS_WINDOW = 10.0 # Seconds of frames the rolling statistics are computed over
+PIPE_READ_SIZE = 64 * 1024 # Bytes taken from the PresentMon pipe per read, many frames at once
 
-        if not os.path.exists(self.presentmon_path):
-            print(f"[FPS] PresentMon.exe not found.")
-            return
+HITCH_THRESHOLD = 4.0 # Default: a frame this many times the running median is a hitch
+HITCH_MIN_MS = 50.0 # Shorter frames are never hitches, doubling a 4 ms frame is invisible
+HITCH_WARMUP_FRAMES = 240 # Frames before the median estimate is trusted
+MEDIAN_STEP = 1.02 # Factor the median estimate moves by per frame
+REPLAY_READ_SIZE = 4096 # Bytes per paced replay read, a fraction of a second of frames
+
+TASKKILL_PATH = r"C:\Windows\System32\taskkill.exe" # Absolute path to bypass embedded environment limits
 
-        # Use Absolute Path for taskkill to bypass embedded environment limits
-        tk_path = r"C:\Windows\System32\taskkill.exe"
+# ==========================================
+# Frame sources
+# ==========================================
+# A frame source delivers raw PresentMon CSV bytes: start() returns False if it can't run,
+# read(size) returns the next bytes (b"" once it is finished), stop() may be called from any thread.
+class PresentMonSource:
+    """Live frame times from PresentMon.exe watching the game process (Windows only)."""
+    def __init__(self, base_dir, process_name="Warframe.x64.exe"):
+        self.base_dir = base_dir
+        self.presentmon_path = os.path.join(base_dir, "PresentMon.exe")
+        self.process_name = process_name
+        self.proc = None
+
+    def _kill_existing(self):
         try:
             subprocess.run(
-                [tk_path, "/F", "/IM", "PresentMon.exe"],
+                [TASKKILL_PATH, "/F", "/IM", "PresentMon.exe"],
                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
                 creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
             )
         except: pass
 
+    def start(self):
+        if not os.path.exists(self.presentmon_path):
+            print(f"[FPS] PresentMon.exe not found.")
+            return False
+
+        self._kill_existing()
+
         # Switch back to STDOUT mode
         cmd = [
             self.presentmon_path,
@@ -54,76 +68,238 @@ class FPSTracker:
             cwd=self.base_dir,
             env=os.environ
         )
-        
-        self.running = True
-        self.thread = threading.Thread(target=self._read_stdout_loop, daemon=True)
-        self.thread.start()
-        print("[FPS] Tracker started (Binary Pipe mode).")
+        return True
+
+    def read(self, size):
+        proc = self.proc
+        if proc is None:
+            return b""
+        return proc.stdout.read1(size)
 
     def stop(self):
-        self.running = False
         if self.proc:
             try: self.proc.terminate()
             except: pass
             self.proc = None
+        self._kill_existing()
+
+class CsvReplaySource:
+    """Streams a saved PresentMon CSV (PresentMon.exe --output_file) as if it came from the pipe.
 
-        tk_path = r"C:\Windows\System32\taskkill.exe"
+    speed 1.0 paces the frames in real time by their own frame times, 10.0 plays ten times
+    faster and 0 delivers everything as fast as the tracker can take it (benchmarks).
+    """
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+        self.file = None
+        self.parser = None
+        self.started_at = 0.0
+        self.replayed_ms = 0.0 # Frame time delivered so far
+
+    def start(self):
+        if not os.path.exists(self.path):
+            print(f"[FPS] Replay file not found: {self.path}")
+            return False
+        self.file = open(self.path, 'rb')
+        self.parser = PresentMonParser() # Only for pacing, the tracker parses the bytes itself
+        self.started_at = time.perf_counter()
+        self.replayed_ms = 0.0
+        return True
+
+    def read(self, size):
+        f = self.file
+        if f is None:
+            return b""
         try:
-            subprocess.run([tk_path, "/F", "/IM", "PresentMon.exe"], 
-                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        except: pass
+            if self.speed <= 0:
+                return f.read(size)
+            data = f.read(min(size, REPLAY_READ_SIZE))
+        except ValueError: # Closed by stop()
+            return b""
+        # Hold the bytes back until the frames in them have "happened"
+        self.replayed_ms += sum(self.parser.feed(data))
+        delay = self.started_at + self.replayed_ms / 1000.0 / self.speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return data
+
+    def stop(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+# ==========================================
+# Tracker
+# ==========================================
+class FPSTracker:
+    def __init__(self, source=None, hitch_threshold=HITCH_THRESHOLD):
+        self.base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.source = source or PresentMonSource(self.base_dir)
+        self.hitch_threshold = hitch_threshold
+        self.thread = None
+        self.running = False
+        # Ring buffer of frame times (ms). frames_total counts every frame ever written,
+        # so frames_total % FRAME_BUFFER_SIZE is the next slot and memory never grows.
+        self.frame_times = np.zeros(FRAME_BUFFER_SIZE, dtype=np.float64)
+        self.frames_total = 0
+        self.frames_read = 0 # frames_total at the last get_fps() call
+        self.last_fps = 0
+        self.last_stats = self._empty_stats()
+        self.median_ms = 0.0 # Running median estimate, only touched by the reader thread
+        self.hitches = [] # (perf_counter time, frame ms, median ms) of every hitch since start()
+        self.hitches_read = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.running:
+            return
+
+        if not self.source.start():
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._read_stdout_loop, daemon=True)
+        self.thread.start()
+        print(f"[FPS] Tracker started ({type(self.source).__name__}).")
+
+    def stop(self):
+        self.running = False
+        self.source.stop()
 
         if self.thread:
             self.thread.join(timeout=1)
             self.thread = None
 
         with self.lock:
-            self.frame_times = []
+            self.frames_total = 0
+            self.frames_read = 0
             self.last_fps = 0
+            self.last_stats = self._empty_stats()
+            self.median_ms = 0.0
+            self.hitches = []
+            self.hitches_read = 0
+
+    def _recent_frames(self, count):
+        """Copy of the newest 'count' frame times in chronological order. Call with the lock held."""
+        count = min(count, self.frames_total, FRAME_BUFFER_SIZE)
+        end = self.frames_total % FRAME_BUFFER_SIZE
+        if count <= end:
+            return self.frame_times[end - count:end].copy()
+        return np.concatenate((self.frame_times[FRAME_BUFFER_SIZE - (count - end):], self.frame_times[:end]))
 
     def get_fps(self):
+        """Average FPS of the frames since the previous call (the FPS column)."""
         with self.lock:
-            if not self.frame_times:
+            new_frames = self.frames_total - self.frames_read
+            if new_frames == 0:
                 return self.last_fps
-            
-            avg_ms = sum(self.frame_times) / len(self.frame_times)
-            self.frame_times = [] # Reset buffer for next interval
-            
-            if avg_ms > 0:
-                self.last_fps = int(round(1000.0 / avg_ms))
-            return self.last_fps
+            frames = self._recent_frames(new_frames)
+            self.frames_read = self.frames_total
+
+        avg_ms = frames.mean()
+        if avg_ms > 0:
+            self.last_fps = int(round(1000.0 / avg_ms))
+        return self.last_fps
+
+    @staticmethod
+    def _empty_stats():
+        return {"avg_fps": 0, "median_fps": 0, "low_1_fps": 0, "low_01_fps": 0, "max_frametime_ms": 0.0}
+
+    def get_frame_stats(self, window=FPS_STATS_WINDOW):
+        """Rolling statistics over the last 'window' seconds of frames.
+
+        Lows are the average FPS of the slowest 1% / 0.1% of those frames, so single
+        long frames (stutter) show up even when the average FPS looks fine.
+        """
+        with self.lock:
+            frames = self._recent_frames(FRAME_BUFFER_SIZE)
+        if frames.size == 0:
+            return self.last_stats
+
+        # Keep the newest frames that add up to the window
+        elapsed = np.cumsum(frames[::-1])
+        frames = frames[frames.size - max(1, int(np.searchsorted(elapsed, window * 1000.0))):]
+
+        slowest = np.sort(frames)[::-1]
+        low_1 = slowest[:max(1, frames.size // 100)].mean()
+        low_01 = slowest[:max(1, frames.size // 1000)].mean()
+        self.last_stats = {
+            "avg_fps": int(round(1000.0 / frames.mean())),
+            "median_fps": int(round(1000.0 / np.median(frames))),
+            "low_1_fps": int(round(1000.0 / low_1)),
+            "low_01_fps": int(round(1000.0 / low_01)),
+            "max_frametime_ms": round(float(slowest[0]), 2),
+        }
+        return self.last_stats
+
+    def pop_hitches(self):
+        """Hitches detected since the previous call, as (perf_counter time, frame ms, median ms)."""
+        with self.lock:
+            new = self.hitches[self.hitches_read:]
+            self.hitches_read = len(self.hitches)
+        return new
+
+    def _detect_hitches(self, frames):
+        """Checks each frame against a running median estimate, O(1) per frame.
+
+        The estimate steps up or down by MEDIAN_STEP towards every frame, so it settles where
+        half the frames are above it without keeping or sorting a window. A single long frame
+        barely moves it, unlike a mean.
+        """
+        if not frames:
+            return
+        median = self.median_ms or frames[0]
+        threshold = self.hitch_threshold
+        warmup = HITCH_WARMUP_FRAMES - self.frames_total # Index of the first frame that may be a hitch
+        found = []
+        for i, ms in enumerate(frames):
+            if ms > median:
+                if ms > HITCH_MIN_MS and ms > median * threshold and i >= warmup:
+                    found.append((ms, median))
+                median *= MEDIAN_STEP
+            else:
+                median /= MEDIAN_STEP
+        self.median_ms = median
+        if found:
+            now = time.perf_counter()
+            with self.lock:
+                self.hitches.extend((now, ms, med) for ms, med in found)
+
+    def _add_frames(self, frames):
+        """Writes a batch of frame times (ms) into the ring buffer."""
+        n = len(frames)
+        if n == 0:
+            return
+        with self.lock:
+            if n > FRAME_BUFFER_SIZE:
+                # Only the newest frames fit, the older ones just count
+                self.frames_total += n - FRAME_BUFFER_SIZE
+                frames = frames[-FRAME_BUFFER_SIZE:]
+                n = FRAME_BUFFER_SIZE
+            start = self.frames_total % FRAME_BUFFER_SIZE
+            first = min(n, FRAME_BUFFER_SIZE - start)
+            self.frame_times[start:start + first] = frames[:first]
+            self.frame_times[:n - first] = frames[first:]
+            self.frames_total += n
 
     def _read_stdout_loop(self):
-        ms_idx = None
-        # We read raw bytes to avoid the German character crash
+        # Raw bytes all the way, nothing is decoded (German Windows output used to crash the decode)
+        parser = PresentMonParser()
         try:
-            for raw_line in self.proc.stdout:
-                if not self.running:
+            while self.running:
+                data = self.source.read(PIPE_READ_SIZE)
+                if not data:
                     break
-
-                # FORCE DECODE: Skip errors like 'ä' or 'ü' that break German Windows
-                line = raw_line.decode("utf-8", errors="ignore").strip()
-                if not line:
-                    continue
-
-                parts = line.split(",")
-
-                # Find the MsBetweenPresents column dynamically
-                if ms_idx is None:
-                    for i, header in enumerate(parts):
-                        if "msbetweenpresents" in header.lower():
-                            ms_idx = i
-                            break
-                    continue
-
-                if ms_idx is not None and len(parts) > ms_idx:
-                    try:
-                        ms = float(parts[ms_idx])
-                        if ms > 0:
-                            with self.lock:
-                                self.frame_times.append(ms)
-                    except ValueError:
-                        pass
+                frames = parser.feed(data)
+                self._detect_hitches(frames)
+                self._add_frames(frames)
         except Exception as e:
             if self.running:
-                print(f"[FPS] Pipe read error: {e}")
\ No newline at end of file
+                print(f"[FPS] Pipe read error: {e}")
+        finally:
+            if self.running and self.thread is threading.current_thread():
+                # The source ended on its own (replay finished, PresentMon exited), let a later start() run again
+                self.running = False
+                self.source.stop()
+                print("[FPS] Frame source ended.")
@@ -0,0 +1,504 @@
+import os
+import time
+import argparse
+import re
+import shutil
+import tempfile
+import threading
+from collections import deque
+
+from log_reader import LogReader, ACOLYTE_MAP
+from file_notifier import PollingNotifier, create_notifier
+from event_bus import EVENT_GENERAL
+from ee_log_generator import SyntheticEELog, write_synthetic_log, stream_synthetic_log
+from log_recording import GzipRecordingSink, open_recording
+from log_replay import replay_recording
+
+# ==========================================
+# Baseline (pre-dispatcher) line parser
+# ==========================================
+class LegacyLineParser:
+    """The original per-line regex chain, kept here as the baseline. Acolyte cooldown is left out."""
+    def __init__(self):
+        self.live_enemies = 0
+        self.total_spawned = 0
+        self.ally_live = 0
+        self.last_engine_time = 0.0
+        self.events = []
+        self.timestamp_pattern = re.compile(r"^(\d+\.\d+)")
+        self.live_pattern = re.compile(r"Live\s+(\d+)")
+        self.spawned_pattern = re.compile(r"Spawned\s+(\d+)")
+        self.ally_live_pattern = re.compile(r"AllyLive\s+(\d+)")
+        self.acolyte_taunt_pattern = re.compile(r"/Lotus/Sounds/Dialog/Taunts/Acolytes/(?P<tag>Duellist|Rogue|Control|Heavy|AreaCaster|Striker)AcolyteTaunt")
+        self.acolyte_scream_pattern = re.compile(r"ScreamDebuffAttachProj")
+        self.acolyte_defeat_pattern = re.compile(r"/Lotus/Sounds/Dialog/Taunts/Acolytes/(?P<tag>Duellist|Rogue|Control|Heavy|AreaCaster|Striker)AcolyteDefeat")
+
+    def _process_line(self, line):
+        ts_match = self.timestamp_pattern.match(line)
+        if ts_match:
+            self.last_engine_time = float(ts_match.group(1))
+        taunt_match = self.acolyte_taunt_pattern.search(line)
+        if taunt_match:
+            self.events.append(ACOLYTE_MAP[taunt_match.group("tag")]['name'])
+            return
+        if self.acolyte_scream_pattern.search(line):
+            self.events.append("Scream")
+            return
+        defeat_match = self.acolyte_defeat_pattern.search(line)
+        if defeat_match:
+            self.events.append(f"{ACOLYTE_MAP[defeat_match.group('tag')]['name']} Dead")
+        if "OnAgentCreated" in line:
+            live_match = self.live_pattern.search(line)
+            if live_match:
+                self.live_enemies = int(live_match.group(1))
+            spawned_match = self.spawned_pattern.search(line)
+            if spawned_match:
+                self.total_spawned = int(spawned_match.group(1))
+            ally_match = self.ally_live_pattern.search(line)
+            if ally_match:
+                self.ally_live = int(ally_match.group(1))
+
+    def get_stats(self):
+        return self.live_enemies, self.total_spawned, self.ally_live
+
+class LegacyTailer:
+    """The original text-mode readline/sleep loop as a background thread, for the stress suite."""
+    def __init__(self, path):
+        self.path = path
+        self.parser = LegacyLineParser()
+        self.current_offset = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def _loop(self):
+        with open(self.path, 'r', encoding='utf-8', errors='ignore') as f:
+            while self.running:
+                current_pos = f.tell()
+                self.current_offset = current_pos
+                line = f.readline()
+                if not line:
+                    time.sleep(0.01)
+                    continue
+                if not line.endswith('\n'):
+                    f.seek(current_pos)
+                    time.sleep(0.05)
+                    continue
+                self.parser._process_line(line)
+
+    def get_stats(self):
+        return self.parser.get_stats()
+
+    def deaths(self):
+        return sum(1 for e in self.parser.events if e.endswith(" Dead"))
+
+# ==========================================
+# Tailing strategies
+# ==========================================
+def legacy_readline_tail(path):
+    """The original text-mode readline loop with the original parser."""
+    parser = LegacyLineParser()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            line = f.readline()
+            if not line or not line.endswith('\n'):
+                break
+            parser._process_line(line)
+    return parser
+
+def chunked_tail(path):
+    reader = LogReader(path)
+    with open(path, 'rb') as f:
+        reader._read_available(f)
+    return reader
+
+def best_of(fn, repeats):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def bench_tailing(path, num_lines, repeats, expected=None):
+    """Whole-file throughput of each tailing strategy in lines/sec."""
+    for name, fn in (("readline", legacy_readline_tail), ("chunked", chunked_tail)):
+        secs, reader = best_of(lambda: fn(path), repeats)
+        stats = reader.get_stats()
+        verdict = ""
+        if expected is not None:
+            verdict = "OK" if stats[:2] == expected else "MISMATCH"
+        print(f"[Bench] {name:<9} {num_lines / secs:>12,.0f} lines/s  ({secs * 1000:.1f} ms)  final={stats} {verdict}")
+
+def read_lines(path):
+    with open_recording(path) as f:
+        return [raw.decode('utf-8', errors='ignore') for raw in f]
+
+def bench_dispatch(path, repeats):
+    """Per-line cost of the legacy regex chain vs. the single-pass dispatcher."""
+    lines = read_lines(path)
+
+    legacy = LegacyLineParser()
+    reader = LogReader(path)
+    reader.last_acolyte_warning_time = float('inf') # No cooldown prints during the benchmark
+    for name, parser in (("legacy", legacy), ("dispatch", reader)):
+        process = parser._process_line
+        def run():
+            for line in lines:
+                process(line)
+        secs, _ = best_of(run, repeats)
+        print(f"[Bench] {name:<9} {secs * 1e9 / len(lines):>8.0f} ns/line  final={parser.get_stats()}")
+
+def bench_spawn_types(path, repeats):
+    """Cost of the per-enemy-type spawn counters on OnAgentCreated lines (the only lines they touch)."""
+    lines = [line for line in read_lines(path) if "OnAgentCreated" in line]
+    if not lines:
+        print("[Bench] no OnAgentCreated lines")
+        return
+    def legacy():
+        process = LegacyLineParser()._process_line
+        for line in lines:
+            process(line)
+    legacy_ns = best_of(legacy, repeats)[0] * 1e9 / len(lines)
+
+    results = {}
+    for tracked in (False, True):
+        def run():
+            reader = LogReader(path)
+            reader.track_spawn_types = tracked
+            process = reader._process_line
+            for line in lines:
+                process(line)
+            return reader
+        secs, reader = best_of(run, repeats)
+        results[tracked] = secs * 1e9 / len(lines)
+    types = reader.get_spawn_stats()
+    overhead = results[True] - results[False]
+    print(f"[Bench] agent lines  {legacy_ns:>6.0f} ns/line legacy, {results[False]:>6.0f} ns/line untracked, {results[True]:>6.0f} ns/line with types "
+          f"(+{overhead:.0f} ns, {overhead / results[False] * 100:.0f}%)")
+    print(f"[Bench] spawn types  {len(types)} types, {reader.spawns.total()} spawns, {len(reader._spawn_appends)} cached type names, "
+          f"{sum(len(t) * t.itemsize for t in reader.spawns.times.values()) / 1024:.0f} KB")
+
+def bench_wakeup(tmp, samples=50, idle_secs=2.0):
+    """Appends lines to a live log and measures write-to-parse latency and idle CPU per notifier."""
+    for name, factory in (("poll", PollingNotifier), ("auto", create_notifier)):
+        path = os.path.join(tmp, f"wakeup_{name}.log")
+        open(path, 'w').close()
+        reader = LogReader(path, notifier_factory=factory)
+        reader.start()
+        time.sleep(0.2)
+
+        # Idle CPU: nothing is written, the reader should be asleep
+        cpu0 = time.process_time()
+        time.sleep(idle_secs)
+        idle_cpu = (time.process_time() - cpu0) / idle_secs * 100
+
+        latencies = []
+        with open(path, 'a', encoding='utf-8') as f:
+            for i in range(1, samples + 1):
+                f.write(f"{i}.000 AI [Info]: OnAgentCreated /Npc/Lancer Live 1 Spawned {i} Ticking 1\n")
+                f.flush()
+                t0 = time.perf_counter()
+                while reader.total_spawned != i and time.perf_counter() - t0 < 1.0:
+                    pass
+                latencies.append(time.perf_counter() - t0)
+                time.sleep(0.02)
+        reader.stop()
+
+        latencies.sort()
+        median = latencies[len(latencies) // 2] * 1000
+        worst = latencies[-1] * 1000
+        probe = factory(path)
+        kind = probe.name
+        probe.close()
+        print(f"[Bench] {name:<5} ({kind:<7}) wakeup median {median:6.2f} ms  max {worst:6.2f} ms  idle CPU {idle_cpu:5.2f}%")
+
+def catch_up_once(path):
+    reader = LogReader(path)
+    with open(path, 'rb') as f:
+        t0 = time.perf_counter()
+        reader._catch_up(f)
+        return time.perf_counter() - t0, reader.get_stats(), f.tell()
+
+def bench_catchup(tmp, path, expected=None, noise_lines=1_000_000):
+    """Startup cost of jumping to the current state, on the benchmark log and on a log without any counters."""
+    secs, stats, offset = catch_up_once(path)
+    verdict = ""
+    if expected is not None:
+        verdict = "OK" if stats[:2] == expected else "MISMATCH"
+    print(f"[Bench] catch-up  {secs * 1000:8.2f} ms  final={stats} resume@{offset} {verdict}")
+
+    # Worst case: no OnAgentCreated line anywhere, the scan has to stop at CATCHUP_MAX_BYTES
+    noise = os.path.join(tmp, "EE_noise.log")
+    write_synthetic_log(noise, noise_lines, agent_ratio=0.0)
+    secs, stats, _ = catch_up_once(noise)
+    size_mb = os.path.getsize(noise) / (1024 * 1024)
+    print(f"[Bench] no counters {secs * 1000:6.2f} ms  ({size_mb:.0f} MB log) final={stats}")
+
+# ==========================================
+# Correctness checks
+# ==========================================
+class GatedNotifier:
+    """Notifier that only wakes the reader when a check releases it, so file changes land while it is idle."""
+    name = "gated"
+
+    def __init__(self, path):
+        self.idle = threading.Event()
+        self.gate = threading.Event()
+
+    def wait(self, timeout):
+        self.idle.set()
+        self.gate.wait()
+        self.gate.clear()
+
+    def close(self):
+        self.gate.set()
+
+def counter_lines(first_time, count, live, header):
+    lines = [f"{first_time:.3f} Sys [Info]: {header}\n"]
+    lines += [f"{first_time + i * 0.5:.3f} AI [Info]: OnAgentCreated /Npc/CorruptedLancer{i} Live {live} Spawned {i} Ticking {live}\n"
+              for i in range(1, count + 1)]
+    return "".join(lines)
+
+def verdict(ok):
+    return "OK" if ok else "FAIL"
+
+def check_truncate_regrow(tmp):
+    """EE.log truncated in place (game restart) and written past the old read offset before the reader looks again."""
+    path = os.path.join(tmp, "EE_truncate.log")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(counter_lines(100.0, 200, 5, "Current time: Mon Jan 05 18:00:00 2026"))
+    notifiers = []
+    reader = LogReader(path, notifier_factory=lambda p: notifiers.append(GatedNotifier(p)) or notifiers[-1])
+    reader.start()
+    while not notifiers or not notifiers[0].idle.wait(0.01):
+        pass
+
+    with open(path, 'r+', encoding='utf-8') as f:
+        f.truncate(0)
+        f.write(counter_lines(1.0, 400, 3, "Current time: Mon Jan 05 18:05:00 2026"))
+    notifier = notifiers[0]
+    notifier.idle.clear()
+    notifier.gate.set()
+    notifier.idle.wait(5.0)
+    reader.stop()
+
+    times = [sample[0] for sample in reader.timeline.range()]
+    monotonic = all(a <= b for a, b in zip(times, times[1:]))
+    ok = reader.resets == 1 and reader.get_stats()[:2] == (3, 400) and reader.kills_total == 195 + 397 and monotonic
+    print(f"[Bench] truncate + regrow   resets {reader.resets}, final={reader.get_stats()}, kills {reader.kills_total}, "
+          f"timeline monotonic: {monotonic}  {verdict(ok)}")
+
+def check_catch_up_mission(tmp):
+    """Attaching mid-mission names the mission, whether its marker or its newest counters come last."""
+    marker = "Script [Info]: ThemedSquadOverlay.lua: Mission name: Lua (Void)\n"
+    cases = (
+        ("marker newest", counter_lines(100.0, 50, 4, "Log start") + "200.000 " + marker, (0, 0)),
+        ("counters newest", counter_lines(100.0, 50, 4, "Log start") + "200.000 " + marker + counter_lines(201.0, 30, 2, "Loaded"), (2, 30)),
+    )
+    for name, text, stats in cases:
+        path = os.path.join(tmp, "EE_catchup_mission.log")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        reader = LogReader(path)
+        with open(path, 'rb') as f:
+            reader._catch_up(f)
+        ok = reader.mission_name == "Lua (Void)" and reader.missions == 1 and reader.get_stats()[:2] == stats
+        print(f"[Bench] catch-up, {name:<15} mission {reader.mission_name!r}, final={reader.get_stats()}  {verdict(ok)}")
+
+def check_replay_restart(tmp):
+    """A recording spanning a game restart replays on one clock, with the counters reset like the live reader."""
+    path = os.path.join(tmp, "ee_recording_restart.log.gz")
+    sink = GzipRecordingSink(path)
+    sink.write(counter_lines(100.0, 120, 4, "Current time: Mon Jan 05 18:00:00 2026").encode())
+    sink.write(counter_lines(1.0, 120, 2, "Current time: Mon Jan 05 18:02:00 2026").encode())
+    sink.close()
+
+    rows = replay_recording(path, {"data_recording_rate": 1000})
+    times = [row["Time"] for row in rows]
+    increasing = all(a < b for a, b in zip(times, times[1:]))
+    reset = any("Log Reset" in row["Event"] for row in rows)
+    ok = len(rows) >= 120 and increasing and reset and rows[-1]["Spawned"] == 120 and rows[-1]["Live"] == 2
+    print(f"[Bench] replay with restart {len(rows)} rows over {times[-1] if times else 0:.0f}s, Log Reset: {reset}, "
+          f"final Spawned {rows[-1]['Spawned'] if rows else None}, times increasing: {increasing}  {verdict(ok)}")
+
+    # Lines written slightly out of order are not a restart
+    path = os.path.join(tmp, "ee_recording_jitter.log")
+    lines = counter_lines(100.0, 120, 4, "Log start").splitlines(keepends=True)
+    lines.insert(60, "129.000 Sys [Info]: Late line\n")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    rows = replay_recording(path, {"data_recording_rate": 1000})
+    reset = any("Log Reset" in row["Event"] for row in rows)
+    ok = not reset and rows[-1]["Spawned"] == 120
+    print(f"[Bench] replay out of order   Log Reset: {reset}, final Spawned {rows[-1]['Spawned']}  {verdict(ok)}")
+
+def check_replay_crashed(tmp):
+    """A gzip recording of a tracker that crashed (no gzip trailer) replays up to its last flush."""
+    path = os.path.join(tmp, "ee_recording_live.log.gz")
+    sink = GzipRecordingSink(path)
+    sink.write(counter_lines(100.0, 120, 4, "Log start").encode())
+    sink.flush()
+    sink.write(counter_lines(160.5, 40, 4, "Not flushed yet").encode())
+    crashed = os.path.join(tmp, "ee_recording_crashed.log.gz")
+    shutil.copyfile(path, crashed) # What is on disk when the process dies
+    sink.close()
+
+    try:
+        rows = replay_recording(crashed, {"data_recording_rate": 1000})
+        error = None
+    except (EOFError, OSError) as e:
+        rows, error = [], e
+    ok = error is None and rows and rows[-1]["Spawned"] == 120
+    print(f"[Bench] replay crashed run   {len(rows)} rows, final Spawned {rows[-1]['Spawned'] if rows else None}"
+          f"{f', {type(error).__name__}: {error}' if error else ''}  {verdict(ok)}")
+
+def check_replay_quiet(tmp):
+    """Log_KPM keeps falling through a stretch without kills, as it does live, instead of holding its last value."""
+    path = os.path.join(tmp, "ee_recording_quiet.log")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(counter_lines(100.0, 120, 4, "Log start"))
+        f.writelines(f"{160.0 + i * 0.5:.3f} Sys [Info]: Nothing to see\n" for i in range(1, 121))
+
+    rows = replay_recording(path, {"data_recording_rate": 1000, "log_kpm_rolling": False})
+    busy = next(row["Log_KPM"] for row in rows if row["Time"] >= 59)
+    quiet = rows[-1]["Log_KPM"]
+    ok = busy > 0 and abs(quiet - busy / 2) <= 2
+    print(f"[Bench] replay quiet stretch cumulative Log_KPM {busy} after 60s of kills, {quiet} after 60s more without  {verdict(ok)}")
+
+def thread_cpu_seconds(thread):
+    """CPU time used so far by another thread (Linux only, None elsewhere)."""
+    try:
+        with open(f"/proc/self/task/{thread.native_id}/stat", 'r') as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, AttributeError, ValueError, IndexError):
+        return None
+
+STRESS_MODES = {
+    "readline": lambda path: LegacyTailer(path),
+    "chunked+poll": lambda path: LogReader(path, notifier_factory=PollingNotifier),
+    "chunked+auto": lambda path: LogReader(path, notifier_factory=create_notifier),
+}
+
+def stress_once(tmp, mode, rate, seconds):
+    """Streams synthetic traffic into a live file while a tailer follows it. Returns a result dict."""
+    path = os.path.join(tmp, f"stress_{mode.replace('+', '_')}_{rate}.log")
+    open(path, 'w').close()
+    reader = STRESS_MODES[mode](path)
+    reader.start()
+    time.sleep(0.1)
+
+    batches = deque() # (time written, end offset) per flushed batch
+    gen = SyntheticEELog(seed=rate)
+    writer = threading.Thread(target=stream_synthetic_log, args=(path, rate, seconds, gen),
+                              kwargs={"on_batch": lambda t, off: batches.append((t, off))}, daemon=True)
+    deaths = 0
+    lags = []
+    cpu0 = thread_cpu_seconds(reader.thread)
+    t_start = time.perf_counter()
+    writer.start()
+
+    # Follow the reader until it has consumed everything the writer produced
+    while True:
+        now = time.perf_counter()
+        offset = reader.current_offset
+        while batches and batches[0][1] <= offset:
+            lags.append(now - batches.popleft()[0])
+        if isinstance(reader, LogReader):
+            deaths += sum(1 for e in reader.events.drain() if e.kind == EVENT_GENERAL and e.data.endswith(" Dead"))
+        if not writer.is_alive() and not batches:
+            break
+        if now - t_start > seconds + 10:
+            break # Reader fell hopelessly behind
+        time.sleep(0.002)
+    elapsed = time.perf_counter() - t_start
+    cpu1 = thread_cpu_seconds(reader.thread)
+    reader.stop()
+
+    if isinstance(reader, LegacyTailer):
+        deaths = reader.deaths()
+    truth = gen.truth()
+    stats = reader.get_stats()
+    lags.sort()
+    return {
+        "lines_per_sec": truth["lines"] / elapsed,
+        "lag_median_ms": lags[len(lags) // 2] * 1000 if lags else float('nan'),
+        "lag_p99_ms": lags[int(len(lags) * 0.99)] * 1000 if lags else float('nan'),
+        "lag_max_ms": lags[-1] * 1000 if lags else float('nan'),
+        "behind": len(batches),
+        "cpu_pct": (cpu1 - cpu0) / elapsed * 100 if cpu0 is not None and cpu1 is not None else float('nan'),
+        "correct": stats == (truth["live"], truth["spawned"], truth["ally_live"]) and deaths == truth["deaths"] and not batches,
+    }
+
+def bench_stress(tmp, rates, seconds, modes):
+    """Sustained throughput, lag behind the writer, reader CPU and final correctness per tailing mode."""
+    print(f"[Bench] {'mode':<13} {'rate':>7} {'lines/s':>9} {'lag med':>8} {'p99':>8} {'max':>8} {'CPU':>6}  result")
+    for rate in rates:
+        for mode in modes:
+            r = stress_once(tmp, mode, rate, seconds)
+            verdict = "OK" if r["correct"] else f"WRONG ({r['behind']} batches unread)" if r["behind"] else "WRONG"
+            print(f"[Bench] {mode:<13} {rate:>7} {r['lines_per_sec']:>9,.0f} {r['lag_median_ms']:>6.1f}ms {r['lag_p99_ms']:>6.1f}ms "
+                  f"{r['lag_max_ms']:>6.1f}ms {r['cpu_pct']:>5.1f}%  {verdict}")
+
+def main():
+    parser = argparse.ArgumentParser(description="LogReader benchmarks on a synthetic or recorded EE.log")
+    parser.add_argument("--lines", type=int, default=500_000, help="Line count of the synthetic log")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--recording", help="Use a recorded log (DEBUG_INFO/ee_recording.log.gz, .lrec or a plain EE.log) instead of a synthetic one")
+    parser.add_argument("--wakeup", action="store_true", help="Also measure write-to-parse latency and idle CPU of the notifiers")
+    parser.add_argument("--stress", action="store_true", help="Also run the live stress suite (writer thread + tailer)")
+    parser.add_argument("--rates", default="2000,20000,100000", help="Comma separated writer line rates for --stress")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Writer duration per stress run")
+    parser.add_argument("--modes", default=",".join(STRESS_MODES), help=f"Comma separated tailing modes for --stress ({', '.join(STRESS_MODES)})")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = None
+        if args.recording:
+            # Tailing and catch-up need a plain file, expand gzip/.lrec recordings once
+            path = os.path.join(tmp, "EE.log")
+            with open_recording(args.recording) as src, open(path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            with open(path, 'rb') as f:
+                num_lines = sum(1 for _ in f)
+        else:
+            path = os.path.join(tmp, "EE.log")
+            num_lines = args.lines
+            expected = write_synthetic_log(path, num_lines)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"[Bench] EE.log: {os.path.basename(args.recording or path)}, {num_lines} lines, {size_mb:.1f} MB")
+
+        print("[Bench] --- Tailing throughput ---")
+        bench_tailing(path, num_lines, args.repeats, expected)
+        print("[Bench] --- Per-line parse cost ---")
+        bench_dispatch(path, args.repeats)
+        bench_spawn_types(path, args.repeats)
+        print("[Bench] --- Startup catch-up ---")
+        bench_catchup(tmp, path, expected)
+        print("[Bench] --- Correctness ---")
+        check_truncate_regrow(tmp)
+        check_catch_up_mission(tmp)
+        check_replay_restart(tmp)
+        check_replay_crashed(tmp)
+        check_replay_quiet(tmp)
+        if args.wakeup:
+            print("[Bench] --- Wakeup latency ---")
+            bench_wakeup(tmp)
+        if args.stress:
+            print("[Bench] --- Live stress ---")
+            rates = [int(r) for r in args.rates.split(",")]
+            bench_stress(tmp, rates, args.seconds, args.modes.split(","))
+
+if __name__ == "__main__":
+    main()
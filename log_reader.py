@@ -1,8 +1,15 @@
 import time
 import re
 import os
+import sys
+import json
+import zlib
 import threading
 
+from file_notifier import create_notifier
+from event_bus import EventBus, EVENT_ACOLYTE, EVENT_ALLIES, EVENT_GENERAL, EVENT_MISSION_START, EVENT_MISSION_END
+from counter_timeline import CounterTimeline, SpawnComposition
+
 ACOLYTE_MAP = {
     "Duellist": {"name": "Violence", "duration": 5.1},
     "Rogue":    {"name": "Mania",    "duration": 5.1},
@@ -13,32 +20,82 @@ ACOLYTE_MAP = {
 }
 SCREAM_ACOLYTE_NAME = "Acolyte" # Generic for Misery/Angst
 SCREAM_DURATION = 11.5
+ACOLYTE_WARNING_COOLDOWN = 180 # 3 minute cooldown between warnings
+
+# Dispatch table: (literal token, extraction pattern, handler).
+# A line is handled by the first rule whose token it contains. The token check is a plain
+# substring test, so the vast majority of lines is rejected without running any regex.
+_ACOLYTE_TAGS = "|".join(ACOLYTE_MAP)
+LOG_RULES = (
+    ("OnAgentCreated",         r"Live\s+(?P<live>\d+)\s+Spawned\s+(?P<spawned>\d+)(?:.*AllyLive\s+(?P<ally>\d+))?", "_on_agent_created"),
+    ("AcolyteTaunt",           rf"/Acolytes/(?P<tag>{_ACOLYTE_TAGS})AcolyteTaunt",  "_on_acolyte_taunt"),
+    ("AcolyteDefeat",          rf"/Acolytes/(?P<tag>{_ACOLYTE_TAGS})AcolyteDefeat", "_on_acolyte_defeat"),
+    ("ScreamDebuffAttachProj", None,                                               "_on_acolyte_scream"),
+    # Mission boundaries. The game restarts Live/Spawned with every mission it loads.
+    ("ThemedSquadOverlay.lua: Mission name:", r"Mission name:\s*(?P<name>.*\S)?", "_on_mission_start"),
+    ("EndOfMatch.lua: Initialize",            None,                               "_on_mission_end"),
+)
+
+# Lines the game writes when a mission starts loading. Counters written before one belong to an earlier mission.
+MISSION_START_MARKERS = tuple(token for token, _, handler in LOG_RULES if handler == "_on_mission_start")
+
+CHUNK_SIZE = 64 * 1024 # Bytes read from EE.log per syscall
+CATCHUP_MAX_BYTES = 8 * 1024 * 1024 # Catch-up never scans further back from EOF than this
+NOTIFY_TIMEOUT = 0.5 # Re-check the file at least this often, even without a change notification
+CHECKPOINT_INTERVAL = 5.0 # Seconds between checkpoint writes
+CHECKPOINT_MAX_AGE = 600 # Older checkpoints are ignored, the mission is most likely over
+CHECKPOINT_HEAD_BYTES = 4096 # Start of EE.log hashed to recognize the same file (it begins with the session's date)
 
 class LogReader:
-    def __init__(self, log_path):
+    def __init__(self, log_path, notifier_factory=create_notifier, checkpoint_path=None):
         self.log_path = log_path
+        self.notifier_factory = notifier_factory # Builds the file-change notifier (inotify or polling)
         self.live_enemies = 0
         self.total_spawned = 0
         self.ally_live = 0
+        self.kills_baseline = 0 # Kills (Spawned - Live) of earlier missions and log files
+        self.kills_total = 0 # kills_baseline + kills of the current mission, a single int so other threads read it consistently
+        self.missions = 0 # Mission start markers seen
+        self.mission_name = None
         self.running = False
         self.thread = None
-        self.triggered_acolytes = [] # Changed from bool to list
-        self.general_events = [] # Queue for other events (Death, etc.)
-        self.lock = threading.Lock() # For thread-safe list access
+        self.timeline = CounterTimeline() # Every counter change with its engine time
+        self.spawns = SpawnComposition() # Spawn times per enemy type
+        self.track_spawn_types = True
+        self._spawn_appends = {} # Enemy type -> append of its SpawnComposition array, one entry per type
+        self.events = EventBus() # Acolyte warnings, ally count changes and general events (Death, Log Reset)
         self.last_acolyte_warning_time = 0
+        self.clock = time.time # Wall clock for the acolyte cooldown. Replaced by engine time during replay.
         self.current_offset = 0
         self.last_engine_time = 0.0
+        self.resets = 0 # Incremented every time EE.log is truncated or replaced
         self.timestamp_pattern = re.compile(r"^(\d+\.\d+)")
+        self.timestamp_bytes_pattern = re.compile(rb"(\d+\.\d+)")
+        self._carry = b"" # Partial trailing line waiting for its newline
+        self._head_len = 0 # Start of the open EE.log that _check_rotation compares, see _remember_head
+        self._head_crc = zlib.crc32(b"")
+        self.recorder = None # Optional sink (e.g. GzipRecordingSink) that gets every byte read while tailing
+
+        # Checkpoint: the reader state is saved to checkpoint_path every CHECKPOINT_INTERVAL seconds,
+        # so a restarted tracker can continue from the same offset instead of catching up
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_providers = {} # name -> callable returning extra JSON state to save (e.g. LogSession)
+        self.restored_checkpoint = None
+        self._resume_offset = None
+        self._last_checkpoint = 0.0
+        if checkpoint_path:
+            self._load_checkpoint()
+
+        # Cheap byte-level pre-filter. Only lines containing one of the rule tokens get decoded.
+        self.mission_start_markers = [marker.encode() for marker in MISSION_START_MARKERS]
+        self.line_filter = re.compile(b"|".join(re.escape(token.encode()) for token, _, _ in LOG_RULES))
+        self.rules = [(token, re.compile(pattern) if pattern else None, getattr(self, handler)) for token, pattern, handler in LOG_RULES]
         
-        # Regex to capture numbers after 'Live' and 'Spawned'
-        # Example: OnAgentCreated /Npc/Lancer Live 31 Spawned 53 Ticking 31
-        self.live_pattern = re.compile(r"Live\s+(\d+)")
+        # Fallbacks for OnAgentCreated lines that don't have the usual 'Live N Spawned M' layout
+        self.live_pattern = re.compile(r"(?<!Ally)Live\s+(\d+)")
         self.spawned_pattern = re.compile(r"Spawned\s+(\d+)")
         self.ally_live_pattern = re.compile(r"AllyLive\s+(\d+)")
 
-        self.acolyte_taunt_pattern = re.compile(r"/Lotus/Sounds/Dialog/Taunts/Acolytes/(?P<tag>Duellist|Rogue|Control|Heavy|AreaCaster|Striker)AcolyteTaunt")
-        self.acolyte_scream_pattern = re.compile(r"ScreamDebuffAttachProj")
-        self.acolyte_defeat_pattern = re.compile(r"/Lotus/Sounds/Dialog/Taunts/Acolytes/(?P<tag>Duellist|Rogue|Control|Heavy|AreaCaster|Striker)AcolyteDefeat")
     def start(self):
         """Starts the monitoring thread."""
         if self.thread is not None and self.thread.is_alive():
@@ -55,110 +112,436 @@ class LogReader:
             self.thread.join(timeout=1.0)
 
     def _monitor_loop(self):
+        try:
+            self._tail_file()
+        finally:
+            if self.recorder:
+                self.recorder.close() # Owned by this thread, so nothing can write to it afterwards
+
+    def _tail_file(self):
         if not os.path.exists(self.log_path):
             print(f"Log file not found: {self.log_path}")
             self.running = False
             return
 
         print(f"[LogReader] Monitoring started: {self.log_path}")
+        first_open = True
         try:
-            with open(self.log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                # Read the last 20KB to get the current state if the game is already running
-                f.seek(0, os.SEEK_END)
-                file_size = f.tell()
-                f.seek(max(0, file_size - 20480)) # Go back 20KB
-                
+            notifier = self.notifier_factory(self.log_path)
+            try:
                 while self.running:
-                    current_pos = f.tell()
-                    self.current_offset = current_pos
-                    line = f.readline()
-                    if not line:
-                        time.sleep(0.01)
-                        continue
-                    
-                    # Ensure we have a complete line (ends with newline)
-                    # This prevents reading a line mid-write and failing the regex
-                    if not line.endswith('\n'):
-                        f.seek(current_pos)
-                        time.sleep(0.05)
-                        continue
-                    
-                    self._process_line(line)
+                    with open(self.log_path, 'rb') as f:
+                        self._carry = b""
+                        if first_open:
+                            if self._resume_offset is not None:
+                                f.seek(self._resume_offset) # Checkpoint of the same file, continue where we stopped
+                            else:
+                                # The game may already be running: jump to its current state instead of replaying history
+                                self._catch_up(f)
+                            first_open = False
+                        self._remember_head(f)
+                        
+                        while self.running:
+                            if self.checkpoint_path and time.monotonic() - self._last_checkpoint >= CHECKPOINT_INTERVAL:
+                                self._save_checkpoint(f)
+                            # Checked before every read: a truncated file that already grew past our offset
+                            # would otherwise be parsed from the middle
+                            reason = self._check_rotation(f)
+                            if reason:
+                                self._reset_state(reason)
+                                break # Reopen the new file from the start
+                            if self._read_available(f):
+                                continue
+                            notifier.wait(NOTIFY_TIMEOUT)
+            finally:
+                notifier.close()
         except Exception as e:
             print(f"Error in LogReader: {e}")
             self.running = False
 
-    def _process_line(self, line):
-        # Extract Engine Timestamp
-        ts_match = self.timestamp_pattern.match(line)
+    def _file_identity(self, f, length):
+        """(inode, device, crc32 of the first 'length' bytes) of an open EE.log. Restores the file position."""
+        st = os.fstat(f.fileno())
+        pos = f.tell()
+        f.seek(0)
+        head = f.read(length)
+        f.seek(pos)
+        return st.st_ino, st.st_dev, zlib.crc32(head)
+
+    def _save_checkpoint(self, f):
+        self._last_checkpoint = time.monotonic()
+        head_len = min(CHECKPOINT_HEAD_BYTES, self.current_offset)
+        ino, dev, crc = self._file_identity(f, head_len)
+        state = {
+            "saved_at": time.time(),
+            "ino": ino, "dev": dev, "head_len": head_len, "head_crc": crc,
+            "offset": self.current_offset,
+            "live": self.live_enemies, "spawned": self.total_spawned, "ally_live": self.ally_live,
+            "kills_baseline": self.kills_baseline, "kills_total": self.kills_total,
+            "missions": self.missions, "mission_name": self.mission_name,
+            "last_engine_time": self.last_engine_time, "time_offset": self.timeline.time_offset,
+            "resets": self.resets,
+            "last_acolyte_warning_time": self.last_acolyte_warning_time,
+        }
+        for name, provider in list(self.checkpoint_providers.items()):
+            state[name] = provider()
+        tmp = self.checkpoint_path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as cp:
+                json.dump(state, cp)
+            os.replace(tmp, self.checkpoint_path) # Never leave a half written checkpoint behind
+        except OSError as e:
+            print(f"[LogReader] Could not save checkpoint: {e}")
+
+    def _load_checkpoint(self):
+        """Restores the state saved by a previous tracker if it belongs to the EE.log that is there now."""
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as cp:
+                state = json.load(cp)
+            age = time.time() - state["saved_at"]
+            if age > CHECKPOINT_MAX_AGE:
+                print(f"[LogReader] Ignoring checkpoint from {age / 60:.0f} min ago.")
+                return
+            with open(self.log_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                identity = self._file_identity(f, state["head_len"])
+            if identity != (state["ino"], state["dev"], state["head_crc"]) or size < state["offset"]:
+                print("[LogReader] Ignoring checkpoint, EE.log was replaced since.")
+                return
+            if size - state["offset"] > CATCHUP_MAX_BYTES:
+                print("[LogReader] Ignoring checkpoint, too much log was written since.")
+                return
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[LogReader] Ignoring unreadable checkpoint: {e}")
+            return
+
+        self.live_enemies = state["live"]
+        self.total_spawned = state["spawned"]
+        self.ally_live = state["ally_live"]
+        self.kills_baseline = state["kills_baseline"]
+        self.kills_total = state["kills_total"]
+        self.missions = state["missions"]
+        self.mission_name = state["mission_name"]
+        self.last_engine_time = state["last_engine_time"]
+        self.timeline.time_offset = state["time_offset"]
+        self.resets = state["resets"]
+        self.last_acolyte_warning_time = state["last_acolyte_warning_time"]
+        self.current_offset = self._resume_offset = state["offset"]
+        self.timeline.append(self.last_engine_time, self.live_enemies, self.total_spawned, self.ally_live, self.kills_total)
+        self.restored_checkpoint = state
+        print(f"[LogReader] Resuming from checkpoint ({age:.0f}s old): offset {self.current_offset}, "
+              f"Live {self.live_enemies} Spawned {self.total_spawned} AllyLive {self.ally_live}")
+
+    def discard_checkpoint(self):
+        """Deletes the checkpoint after a clean run end, the next run starts fresh."""
+        if self.checkpoint_path:
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
+
+    def _catch_up(self, f):
+        """Seeds the counters from the end of an already written log and leaves f after its last complete line.
+
+        Walks backwards from EOF in CHUNK_SIZE blocks for the newest OnAgentCreated line and the newest
+        mission start marker. Counters older than the marker belong to the previous mission and are not used.
+        Nothing in between is replayed, so no stale acolyte warnings fire, and at most CATCHUP_MAX_BYTES
+        are read however large EE.log has grown.
+        """
+        started = time.perf_counter()
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        tail_start = None
+        scanned = 0
+        counter_line = None
+        marker_line = None
+        for offset, block in self._reverse_blocks(f, end):
+            scanned = end - offset
+            if tail_start is None:
+                # The newest block may end in a line the game is still writing, leave that to the tail loop
+                tail_start = offset + block.rfind(b"\n") + 1
+                block = block[:tail_start - offset]
+                if block:
+                    self._set_engine_time(block)
+            marker_at = max(block.rfind(marker) for marker in self.mission_start_markers)
+            if counter_line is None:
+                counter_at = block.rfind(b"OnAgentCreated")
+                if counter_at > marker_at:
+                    counter_line = self._line_at(block, counter_at)
+            if marker_at >= 0:
+                marker_line = self._line_at(block, marker_at)
+                break # Anything older belongs to an earlier mission
+
+        if tail_start is None:
+            tail_start = 0
+        if marker_line:
+            # Name the mission we attach to, without a Mission Start event for a mission that began before us
+            pattern = next(pattern for token, pattern, handler in self.rules if handler == self._on_mission_start)
+            match = pattern.search(marker_line)
+            self.missions += 1
+            self.mission_name = (match.group("name") or "") if match else ""
+        if counter_line:
+            engine_time = self.last_engine_time
+            self._process_line(counter_line)
+            self.last_engine_time = max(engine_time, self.last_engine_time)
+            self.spawns = SpawnComposition() # That spawn happened before we started
+            self._spawn_appends = {}
+        f.seek(tail_start)
+        self.current_offset = tail_start
+        print(f"[LogReader] Caught up: Live {self.live_enemies} Spawned {self.total_spawned} AllyLive {self.ally_live}, "
+              f"mission {self.mission_name or 'unknown'} (scanned {scanned / 1024:.0f} KB of {end / 1024:.0f} KB in {(time.perf_counter() - started) * 1000:.1f} ms)")
+
+    @staticmethod
+    def _line_at(block, pos):
+        """The decoded line of block that contains byte position pos."""
+        start = block.rfind(b"\n", 0, pos) + 1
+        end = block.find(b"\n", pos)
+        return block[start:end if end >= 0 else len(block)].decode('utf-8', errors='ignore')
+
+    def _reverse_blocks(self, f, end):
+        """Yields (offset, block) pairs walking backwards from 'end'. Each block starts at a line start."""
+        pos = end
+        head = b"" # First, possibly partial, line of the previous read. Completed by the next one.
+        while pos > 0 and end - pos < CATCHUP_MAX_BYTES:
+            size = min(CHUNK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            buf = f.read(size) + head
+            cut = 0
+            if pos > 0:
+                cut = buf.find(b"\n") + 1
+                if cut == 0:
+                    head = buf # Very long line, keep reading
+                    continue
+            head = buf[:cut]
+            yield pos + cut, buf[cut:]
+
+    def _remember_head(self, f):
+        """Hashes the start of the open EE.log, as far as it has been read (up to CHECKPOINT_HEAD_BYTES)."""
+        self._head_len = min(CHECKPOINT_HEAD_BYTES, self.current_offset)
+        self._head_crc = self._file_identity(f, self._head_len)[2]
+
+    def _check_rotation(self, f):
+        """Returns 'replaced' or 'truncated' if EE.log changed under our open handle, else None."""
+        try:
+            on_disk = os.stat(self.log_path)
+        except FileNotFoundError:
+            return None # Game is recreating the file, look again on the next wakeup
+        opened = os.fstat(f.fileno())
+        if (on_disk.st_ino, on_disk.st_dev) != (opened.st_ino, opened.st_dev):
+            return "replaced"
+        if on_disk.st_size < f.tell():
+            return "truncated"
+        # Truncated in place and written again: the size alone can't tell, the first bytes can
+        if self._file_identity(f, self._head_len)[2] != self._head_crc:
+            return "truncated"
+        if self._head_len < CHECKPOINT_HEAD_BYTES and self.current_offset > self._head_len:
+            self._remember_head(f)
+        return None
+
+    def _reset_state(self, reason):
+        """Drops all counters after a game restart and queues a 'Log Reset' event."""
+        print(f"[LogReader] EE.log was {reason} (game restart?). Reopening and resetting counters.")
+        # Bump the generation before zeroing, so a reader that sees zeroed counters also sees the new generation
+        self.resets += 1
+        self.timeline.add_time_offset(self.last_engine_time)
+        self._close_mission_counters()
+        self.ally_live = 0
+        self.last_engine_time = 0.0
+        self.current_offset = 0
+        self._carry = b""
+        self.events.publish(EVENT_GENERAL, "Log Reset")
+
+    def _read_available(self, f):
+        """Reads everything currently appended to the file in large chunks. Returns the number of bytes read."""
+        total = 0
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            total += len(data)
+            if self.recorder:
+                self.recorder.write(data)
+            self._feed(data)
+            self.current_offset = f.tell() - len(self._carry)
+            if len(data) < CHUNK_SIZE:
+                break
+        return total
+
+    def _feed(self, data):
+        """Splits raw bytes into complete lines and keeps the unfinished tail for the next read."""
+        buf = self._carry + data if self._carry else data
+        cut = buf.rfind(b"\n") + 1
+        if cut == 0:
+            # No newline yet, the line is still being written
+            self._carry = buf
+            return
+        self._carry = buf[cut:]
+        self._process_chunk(buf[:cut])
+
+    def _process_chunk(self, block):
+        """Processes a block of complete lines, decoding only the ones that pass the byte filter."""
+        last_end = -1
+        for m in self.line_filter.finditer(block):
+            if m.start() < last_end:
+                continue # Same line matched twice
+            start = block.rfind(b"\n", 0, m.start()) + 1
+            end = block.find(b"\n", m.end())
+            last_end = end
+            self._process_line(block[start:end].decode('utf-8', errors='ignore'))
+
+        self._set_engine_time(block)
+
+    def _set_engine_time(self, block):
+        """Engine time only needs the most recent line of a block, not every line in between."""
+        last_start = block.rfind(b"\n", 0, len(block) - 1) + 1
+        ts_match = self.timestamp_bytes_pattern.match(block, last_start)
         if ts_match:
             try:
                 self.last_engine_time = float(ts_match.group(1))
             except ValueError:
                 pass
 
-        # Acolyte Checks first
-        taunt_match = self.acolyte_taunt_pattern.search(line)
-        if taunt_match:
-            tag = taunt_match.group("tag")
-            if tag in ACOLYTE_MAP:
-                now = time.time()
-                if now - self.last_acolyte_warning_time < 180: # 3 minute cooldown
-                    return
-                self.last_acolyte_warning_time = now
-                
-                acolyte = ACOLYTE_MAP[tag]
-                print(f"[LogReader] ACOLYTE WARNING DETECTED: {acolyte['name']}")
-                with self.lock:
-                    self.triggered_acolytes.append((acolyte['name'], acolyte['duration']))
-                return 
-
-        if self.acolyte_scream_pattern.search(line):
-            now = time.time()
-            if now - self.last_acolyte_warning_time < 180:
-                return
-            self.last_acolyte_warning_time = now
-            print(f"[LogReader] ACOLYTE WARNING DETECTED: {SCREAM_ACOLYTE_NAME} (Scream)")
-            with self.lock:
-                self.triggered_acolytes.append((SCREAM_ACOLYTE_NAME, SCREAM_DURATION))
+    def _process_line(self, line):
+        for token, pattern, handler in self.rules:
+            if token in line:
+                break
+        else:
             return
 
-        # Acolyte Death (Defeat)
-        defeat_match = self.acolyte_defeat_pattern.search(line)
-        if defeat_match:
-            tag = defeat_match.group("tag")
-            if tag in ACOLYTE_MAP:
-                name = ACOLYTE_MAP[tag]['name']
-                with self.lock:
-                    self.general_events.append(f"{name} Dead")
+        # Extract Engine Timestamp
+        ts_match = self.timestamp_pattern.match(line)
+        if ts_match:
+            self.last_engine_time = float(ts_match[1]) # Always digits.digits, float() can't fail
+
+        match = None
+        if pattern is not None:
+            match = pattern.search(line)
+        handler(line, match)
 
-        if "OnAgentCreated" in line:
+    def _on_agent_created(self, line, match):
+        # Runs for every spawn, the hottest path in the reader: one groups() call, locals instead of attributes
+        if match:
+            live, spawned, ally = match.groups()
+            live = int(live)
+            spawned = int(spawned)
+        else:
             live_match = self.live_pattern.search(line)
-            if live_match:
-                self.live_enemies = int(live_match.group(1))
-            
             spawned_match = self.spawned_pattern.search(line)
-            if spawned_match:
-                self.total_spawned = int(spawned_match.group(1))
-            
             ally_match = self.ally_live_pattern.search(line)
-            if ally_match:
-                self.ally_live = int(ally_match.group(1))
+            live = int(live_match.group(1)) if live_match else self.live_enemies
+            spawned = int(spawned_match.group(1)) if spawned_match else self.total_spawned
+            ally = ally_match.group(1) if ally_match else None
+        engine_time = self.last_engine_time
+        timeline = self.timeline
+
+        if self.track_spawn_types:
+            if match:
+                # '.../CorruptedLancerAvatar12 Live 3 ...': the type name ends where the counters start
+                live_at = match.start()
+                slash = line.rfind("/", 0, live_at)
+                agent_type = line[slash + 1:live_at].rstrip(" \t0123456789") if slash >= 0 else "Unknown"
+            else:
+                start = line.find("OnAgentCreated") + len("OnAgentCreated ")
+                agent_type = self._agent_type(line[start:line.find(" ", start)])
+            append = self._spawn_appends.get(agent_type)
+            if append is None:
+                append = self._spawn_append(agent_type)
+            append(timeline.time_offset + engine_time)
+
+        if spawned < self.total_spawned:
+            # Spawned only grows within a mission. It went back, so a new mission started without a marker we know.
+            self._close_mission_counters()
+        self.live_enemies = live
+        self.total_spawned = spawned
+        kills = self.kills_baseline + (spawned - live if spawned > live else 0)
+        self.kills_total = kills
+        if ally is None:
+            ally = self.ally_live
+        else:
+            ally = int(ally)
+            if ally != self.ally_live:
+                self._set_ally_live(ally)
+
+        timeline.append(engine_time, live, spawned, ally, kills)
+
+    def _spawn_append(self, agent_type):
+        """Looks up a type name seen for the first time. Only real type names are cached, so the cache stays one entry per type."""
+        if not agent_type or " " in agent_type:
+            agent_type = "Unknown" # The slash we found was not part of an agent path
+        append = self._spawn_appends.get(agent_type)
+        if append is None:
+            append = self._spawn_appends[agent_type] = self.spawns.appender(sys.intern(agent_type))
+        return append
+
+    @staticmethod
+    def _agent_type(agent):
+        """'/Npc/CorruptedLancerAvatar12' -> 'CorruptedLancerAvatar' (path and instance number dropped)."""
+        if not agent.startswith("/"):
+            return sys.intern("Unknown") # Line without an agent path
+        return sys.intern(agent.rsplit("/", 1)[-1].rstrip("0123456789") or "Unknown")
+
+    def _close_mission_counters(self):
+        """Moves the current mission's kills into the baseline and zeroes Live/Spawned. kills_total stays the same."""
+        self.kills_baseline = self.kills_total
+        self.live_enemies = 0
+        self.total_spawned = 0
+
+    def mission_kills(self):
+        """Kills counted in the current mission."""
+        return self.kills_total - self.kills_baseline
+
+    def _on_mission_start(self, line, match):
+        name = (match.group("name") or "") if match else ""
+        self.missions += 1
+        self.mission_name = name
+        self._close_mission_counters()
+        self.timeline.append(self.last_engine_time, 0, 0, self.ally_live, self.kills_total)
+        print(f"[LogReader] Mission started: {name or 'unknown'}")
+        self.events.publish(EVENT_MISSION_START, name, self.last_engine_time)
+
+    def _on_mission_end(self, line, match):
+        kills = self.mission_kills()
+        print(f"[LogReader] Mission ended: {self.mission_name or 'unknown'} ({kills} kills)")
+        self.events.publish(EVENT_MISSION_END, (self.mission_name or "", kills), self.last_engine_time)
+
+    def _set_ally_live(self, value):
+        if value != self.ally_live:
+            self.ally_live = value
+            self.events.publish(EVENT_ALLIES, value, self.last_engine_time)
+
+    def _on_acolyte_taunt(self, line, match):
+        if match:
+            acolyte = ACOLYTE_MAP[match.group("tag")]
+            self._trigger_acolyte_warning(acolyte['name'], acolyte['duration'])
+
+    def _on_acolyte_defeat(self, line, match):
+        if match:
+            name = ACOLYTE_MAP[match.group("tag")]['name']
+            self.events.publish(EVENT_GENERAL, f"{name} Dead", self.last_engine_time)
+
+    def _on_acolyte_scream(self, line, match):
+        self._trigger_acolyte_warning(SCREAM_ACOLYTE_NAME, SCREAM_DURATION, "(Scream)")
+
+    def _trigger_acolyte_warning(self, name, duration, note=""):
+        now = self.clock()
+        if now - self.last_acolyte_warning_time < ACOLYTE_WARNING_COOLDOWN:
+            return
+        self.last_acolyte_warning_time = now
+        print(f"[LogReader] ACOLYTE WARNING DETECTED: {name} {note}".rstrip())
+        self.events.publish(EVENT_ACOLYTE, (name, duration), self.last_engine_time)
+
+    def engine_now(self):
+        """Engine time of the newest line read, on the timeline's clock (keeps counting across game restarts)."""
+        return self.timeline.time_offset + self.last_engine_time
+
+    def get_spawn_stats(self, window=None):
+        """Returns {enemy type: spawns}, most spawned first, over the last 'window' engine seconds or everything read."""
+        start = None if window is None else self.engine_now() - window
+        return self.spawns.counts(start)
 
     def get_stats(self):
         """Returns a tuple (live_enemies, total_spawned, ally_live)."""
         return self.live_enemies, self.total_spawned, self.ally_live
-    
-    def check_and_clear_acolyte_warning(self):
-        """Pops one acolyte warning from the queue if available."""
-        with self.lock:
-            if self.triggered_acolytes:
-                return self.triggered_acolytes.pop(0)
-        return None
-
-    def check_and_clear_general_events(self):
-        """Pops one general event from the queue if available."""
-        with self.lock:
-            if self.general_events:
-                return self.general_events.pop(0)
-        return None
@@ -0,0 +1,341 @@
+import io
+import os
+import re
+import gzip
+import zlib
+import time
+import struct
+import argparse
+
+from log_reader import LOG_RULES, CHUNK_SIZE
+
+# ==========================================
+# Full recording (every byte of EE.log)
+# ==========================================
+RECORDING_FLUSH_INTERVAL = 5.0 # Seconds between gzip sync flushes, the most a crash can lose
+
+class GzipRecordingSink:
+    """Streams the raw EE.log bytes LogReader reads into a gzip file (DEBUG_INFO/ee_recording.log.gz).
+
+    Only the reader thread writes, so no locking is needed. Closing writes the gzip trailer.
+    The stream is sync flushed every RECORDING_FLUSH_INTERVAL seconds, so a recording cut short
+    by a crash can still be read up to the last flush (see open_recording).
+    """
+    def __init__(self, path, compresslevel=3):
+        self.path = path
+        self.file = gzip.open(path, 'wb', compresslevel=compresslevel) # Low level, it runs while the game is playing
+        self.bytes_written = 0 # Uncompressed bytes, i.e. the offset into the recorded log
+        self._last_flush = time.monotonic()
+
+    def write(self, data):
+        if self.file is None:
+            return
+        self.file.write(data)
+        self.bytes_written += len(data)
+        if time.monotonic() - self._last_flush >= RECORDING_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Writes out everything compressed so far, readable without the gzip trailer."""
+        if self.file is not None:
+            self.file.flush() # Z_SYNC_FLUSH, the stream stays open
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+# ==========================================
+# Filtered recording (.lrec)
+# ==========================================
+# Layout: magic + version, then blocks of zlib compressed records, then an index of the blocks
+# and a footer pointing at it. Each record is (engine time, category, original line).
+# Blocks are flushed as they fill up, so a recording cut short by a crash is still readable
+# by walking the block headers; the index only makes opening and time lookups instant.
+RECORDING_MAGIC = b"LECTAREC"
+RECORDING_VERSION = 1
+RECORD_CATEGORIES = tuple(handler[len("_on_"):] for _, _, handler in LOG_RULES) + ("time",)
+CATEGORY_TIME = len(RECORD_CATEGORIES) - 1 # Timestamp-only record, keeps engine time moving between kept lines
+TIME_HEARTBEAT = 1.0 # Engine seconds between timestamp-only records
+BLOCK_RECORDS = 4096
+
+_VERSION = struct.Struct("<H")
+_BLOCK_HEADER = struct.Struct("<IIdd") # Compressed size, record count, first time, last time
+_RECORD_HEADER = struct.Struct("<dBH") # Engine time, category, line length
+_INDEX_ENTRY = struct.Struct("<QIdd")  # Block offset, record count, first time, last time
+_FOOTER = struct.Struct("<QI8s")       # Index offset, block count, magic
+
+class FilteredRecordingSink:
+    """Keeps only the EE.log lines LogReader has a rule for, plus engine timestamps (DEBUG_INFO/ee_recording.lrec).
+
+    Same interface as GzipRecordingSink: the reader thread passes every chunk it reads to write().
+    """
+    def __init__(self, path, compresslevel=6):
+        self.path = path
+        self.compresslevel = compresslevel
+        self.file = open(path, 'wb')
+        self.file.write(RECORDING_MAGIC + _VERSION.pack(RECORDING_VERSION))
+        self.tokens = [token.encode() for token, _, _ in LOG_RULES]
+        self.line_filter = re.compile(b"|".join(re.escape(token) for token in self.tokens))
+        self.timestamp_pattern = re.compile(rb"(\d+\.\d+)")
+        self.bytes_written = 0 # Uncompressed EE.log bytes seen, i.e. the offset into the recorded log
+        self.records_written = 0
+        self.index = []
+        self._carry = b""
+        self._records = []
+        self._first_time = None
+        self._last_time = 0.0
+        self._last_record_time = float('-inf')
+
+    def write(self, data):
+        if self.file is None:
+            return
+        self.bytes_written += len(data)
+        buf = self._carry + data if self._carry else data
+        cut = buf.rfind(b"\n") + 1
+        self._carry = buf[cut:]
+        if cut == 0:
+            return
+        block = buf[:cut]
+        if self._first_time is None and not self.index:
+            # The first line of the run anchors log_replay's tick schedule, keep its time even if the line is dropped
+            ts_match = self.timestamp_pattern.match(block)
+            if ts_match:
+                self._add(float(ts_match.group(1)), CATEGORY_TIME, b"")
+
+        last_end = -1
+        for m in self.line_filter.finditer(block):
+            if m.start() < last_end:
+                continue # Same line matched twice
+            start = block.rfind(b"\n", 0, m.start()) + 1
+            end = block.find(b"\n", m.end())
+            last_end = end
+            line = block[start:end].rstrip(b"\r")
+            ts_match = self.timestamp_pattern.match(line)
+            if ts_match:
+                self._last_time = float(ts_match.group(1))
+            category = next(i for i, token in enumerate(self.tokens) if token in line)
+            self._add(self._last_time, category, line)
+
+        last_start = block.rfind(b"\n", 0, len(block) - 1) + 1
+        ts_match = self.timestamp_pattern.match(block, last_start)
+        if ts_match:
+            self._last_time = float(ts_match.group(1))
+            since = self._last_time - self._last_record_time
+            if since >= TIME_HEARTBEAT or since < 0: # < 0: engine clock restarted with the game
+                self._add(self._last_time, CATEGORY_TIME, b"")
+
+    def _add(self, engine_time, category, line):
+        line = line[:0xFFFF]
+        self._records.append(_RECORD_HEADER.pack(engine_time, category, len(line)) + line)
+        if self._first_time is None:
+            self._first_time = engine_time
+        self._last_record_time = engine_time
+        if len(self._records) >= BLOCK_RECORDS:
+            self._flush_block()
+
+    def _flush_block(self):
+        if not self._records:
+            return
+        payload = zlib.compress(b"".join(self._records), self.compresslevel)
+        offset = self.file.tell()
+        self.file.write(_BLOCK_HEADER.pack(len(payload), len(self._records), self._first_time, self._last_record_time))
+        self.file.write(payload)
+        self.file.flush()
+        self.index.append((offset, len(self._records), self._first_time, self._last_record_time))
+        self.records_written += len(self._records)
+        self._records = []
+        self._first_time = None
+
+    def close(self):
+        if self.file is None:
+            return
+        if (self._records or self.index) and self._last_time != self._last_record_time:
+            self._add(self._last_time, CATEGORY_TIME, b"") # Where the run ended
+        self._flush_block()
+        index_offset = self.file.tell()
+        for entry in self.index:
+            self.file.write(_INDEX_ENTRY.pack(*entry))
+        self.file.write(_FOOTER.pack(index_offset, len(self.index), RECORDING_MAGIC))
+        self.file.close()
+        self.file = None
+
+class FilteredRecording:
+    """Reader for .lrec recordings.
+
+    records() yields (engine_time, category, line) and only decompresses the blocks that
+    overlap the requested time range. lines() rebuilds an EE.log-like byte stream for log_replay.py.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        header = self.file.read(len(RECORDING_MAGIC) + _VERSION.size)
+        if header[:len(RECORDING_MAGIC)] != RECORDING_MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a filtered EE.log recording")
+        self.version = _VERSION.unpack(header[len(RECORDING_MAGIC):])[0]
+        self.index = self._read_index()
+
+    def _read_index(self):
+        size = self.file.seek(0, os.SEEK_END)
+        if size >= _FOOTER.size:
+            self.file.seek(size - _FOOTER.size)
+            index_offset, count, magic = _FOOTER.unpack(self.file.read(_FOOTER.size))
+            if magic == RECORDING_MAGIC:
+                self.file.seek(index_offset)
+                raw = self.file.read(count * _INDEX_ENTRY.size)
+                return [_INDEX_ENTRY.unpack_from(raw, i * _INDEX_ENTRY.size) for i in range(count)]
+
+        # No footer (the run did not end cleanly): walk the block headers instead
+        index = []
+        offset = len(RECORDING_MAGIC) + _VERSION.size
+        while offset + _BLOCK_HEADER.size <= size:
+            self.file.seek(offset)
+            length, count, first, last = _BLOCK_HEADER.unpack(self.file.read(_BLOCK_HEADER.size))
+            if offset + _BLOCK_HEADER.size + length > size:
+                break # Block was being written
+            index.append((offset, count, first, last))
+            offset += _BLOCK_HEADER.size + length
+        return index
+
+    def __len__(self):
+        return sum(entry[1] for entry in self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def time_range(self):
+        """(first, last) engine time in the recording, or None if it is empty."""
+        if not self.index:
+            return None
+        return self.index[0][2], self.index[-1][3]
+
+    def _block_records(self, offset):
+        self.file.seek(offset)
+        length, count, _, _ = _BLOCK_HEADER.unpack(self.file.read(_BLOCK_HEADER.size))
+        payload = zlib.decompress(self.file.read(length))
+        pos = 0
+        for _ in range(count):
+            engine_time, category, n = _RECORD_HEADER.unpack_from(payload, pos)
+            pos += _RECORD_HEADER.size
+            yield engine_time, category, payload[pos:pos + n]
+            pos += n
+
+    def records(self, start=None, end=None, categories=None):
+        """Yields (engine_time, category name, line) for records with start <= time <= end.
+
+        categories limits the output to some of RECORD_CATEGORIES, e.g. ("agent_created",).
+        Times are compared per block, so a game restart inside the range may yield a few extra blocks.
+        """
+        wanted = None
+        if categories is not None:
+            wanted = {RECORD_CATEGORIES.index(c) for c in categories}
+        for offset, _, first, last in self.index:
+            if (start is not None and max(first, last) < start) or (end is not None and min(first, last) > end):
+                continue
+            for engine_time, category, line in self._block_records(offset):
+                if wanted is not None and category not in wanted:
+                    continue
+                if (start is not None and engine_time < start) or (end is not None and engine_time > end):
+                    continue
+                yield engine_time, RECORD_CATEGORIES[category], line.decode('utf-8', errors='ignore')
+
+    def lines(self):
+        """Yields the recording as EE.log lines (bytes with newline). Timestamp-only records become a bare timestamp line."""
+        for offset, _, _, _ in self.index:
+            for engine_time, category, line in self._block_records(offset):
+                yield (line if category != CATEGORY_TIME else f"{engine_time:.3f}".encode()) + b"\n"
+
+    def counts(self):
+        """Number of records per category."""
+        counts = dict.fromkeys(RECORD_CATEGORIES, 0)
+        for offset, _, _, _ in self.index:
+            for _, category, _ in self._block_records(offset):
+                counts[RECORD_CATEGORIES[category]] += 1
+        return counts
+
+class _GzipRecordingReader(io.RawIOBase):
+    """Decompresses a .log.gz recording. One cut short by a crash ends at its last sync flush,
+    where gzip.open would raise EOFError for the missing trailer."""
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.pending = b""
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self.pos >= len(self.pending):
+            data = self.file.read(CHUNK_SIZE)
+            if self.decompressor.eof:
+                # Another gzip member follows (or nothing, then data is empty)
+                data = self.decompressor.unused_data + data
+                self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if not data:
+                return 0
+            self.pending = self.decompressor.decompress(data)
+            self.pos = 0
+        n = min(len(b), len(self.pending) - self.pos)
+        b[:n] = self.pending[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+def open_recording(path):
+    """Opens an EE.log recording for binary reading: plain, gzip compressed or a filtered .lrec."""
+    with open(path, 'rb') as f:
+        magic = f.read(len(RECORDING_MAGIC))
+    if magic == RECORDING_MAGIC:
+        with FilteredRecording(path) as rec:
+            return io.BytesIO(b"".join(rec.lines()))
+    if magic[:2] == b"\x1f\x8b":
+        return io.BufferedReader(_GzipRecordingReader(path), CHUNK_SIZE)
+    return open(path, 'rb')
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an EE.log (or ee_recording.log.gz) into a filtered .lrec recording, or show what a .lrec contains.")
+    parser.add_argument("recording", help="EE.log, ee_recording.log(.gz) or .lrec file")
+    parser.add_argument("--out", help="Output .lrec (defaults to the input name with .lrec)")
+    args = parser.parse_args()
+
+    with open(args.recording, 'rb') as f:
+        is_lrec = f.read(len(RECORDING_MAGIC)) == RECORDING_MAGIC
+    if is_lrec:
+        t0 = time.perf_counter()
+        with FilteredRecording(args.recording) as rec:
+            counts = rec.counts()
+            span = rec.time_range()
+        print(f"[Recording] {len(rec.index)} blocks, read in {(time.perf_counter() - t0) * 1000:.1f} ms, engine time {span}")
+        for category, count in counts.items():
+            print(f"[Recording] {category:<16} {count}")
+        return
+
+    out = args.out or re.sub(r"(\.log)?(\.gz)?$", "", args.recording) + ".lrec"
+    t0 = time.perf_counter()
+    sink = FilteredRecordingSink(out)
+    with open_recording(args.recording) as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            sink.write(data)
+    sink.close()
+    size_in = os.path.getsize(args.recording)
+    size_out = os.path.getsize(out)
+    print(f"[Recording] {sink.bytes_written / 1024:.0f} KB of log ({size_in / 1024:.0f} KB on disk) -> {size_out / 1024:.0f} KB "
+          f"({sink.bytes_written / max(1, size_out):.0f}x smaller than the raw log), {sink.records_written} records in {time.perf_counter() - t0:.2f}s: {out}")
+
+if __name__ == "__main__":
+    main()
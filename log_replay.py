@@ -0,0 +1,170 @@
+import os
+import csv
+import json
+import time
+import argparse
+
+from log_reader import LogReader
+from log_session import LogSession, log_kpm_column, merge_event
+from log_recording import open_recording
+
+# Columns that come from TAB scans / FPS and can only be copied over from an original run
+STATE_COLUMN_PREFIXES = ("Credits", "CPM", "Kills", "KPM", "Tab_KPM", "FPS", "Frametime")
+
+# A restarted game writes a new EE.log whose engine clock starts over. Timestamps that only step back
+# a little are out of order lines, not a restart.
+RESTART_MIN_DROP = 10.0 # Engine seconds the clock has to go back by
+RESTART_NEW_LOG_TIME = 2.0 # ...or it falls back to the first seconds of a new log
+
+class ReplayClock:
+    """Simulated clock driven by the engine timestamps of the recording."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def replay_recording(recording_path, settings):
+    """Feeds a recorded EE.log through LogReader/LogSession on engine time.
+
+    Returns the master log rows (Time, Live, Spawned, Event, Log_KPM) exactly as
+    WarframeTracker.update_log_data would have written them every data_recording_rate ms.
+    """
+    rate = settings.get('data_recording_rate', 100) / 1000.0
+    clock = ReplayClock()
+    reader = LogReader(recording_path)
+    reader.clock = clock
+    reader.last_acolyte_warning_time = float('-inf') # Engine time starts near 0, don't block the first warning
+    session = LogSession(reader, settings)
+
+    rows = []
+    pending = {"event": "Start"}
+    state = {"start": None, "next_tick": 0.0}
+
+    def run_ticks(until):
+        """Runs every tick scheduled before engine time 'until'."""
+        while state["start"] + state["next_tick"] < until:
+            elapsed = state["next_tick"]
+            clock.now = state["start"] + elapsed
+            tick = session.tick(elapsed / 60)
+            for event in tick["events"]:
+                pending["event"] = merge_event(pending["event"], event)
+            if tick["ready"]:
+                rows.append({
+                    "Time": round(elapsed, 2),
+                    "Live": tick["live"],
+                    "Spawned": tick["spawned"],
+                    "Event": pending["event"],
+                    "Log_KPM": int(tick["kpm"]),
+                })
+                pending["event"] = ""
+            state["next_tick"] += rate
+
+    with open_recording(recording_path) as f:
+        # The live tracker already knew the mission counters when F8 was pressed (it starts reading
+        # before the recording offset). Seed them from the first counter line to get the same baseline.
+        for raw in f:
+            if b"OnAgentCreated" in raw:
+                # Counters only: the loop below reaches this line again and counts its spawn
+                tracking, reader.track_spawn_types = reader.track_spawn_types, False
+                reader._process_line(raw.decode('utf-8', errors='ignore'))
+                reader.track_spawn_types = tracking
+                break
+
+    with open_recording(recording_path) as f:
+        engine_time = None
+        for raw in f:
+            ts_match = reader.timestamp_bytes_pattern.match(raw)
+            if ts_match:
+                line_time = float(ts_match.group(1))
+                if engine_time is not None and (line_time <= engine_time - RESTART_MIN_DROP
+                                                or line_time < RESTART_NEW_LOG_TIME <= engine_time):
+                    # The game restarted and the recording continues with the new EE.log. Reset the
+                    # counters like the live reader did and keep the clock running on the timeline's offset.
+                    reader._reset_state("replaced")
+                engine_time = line_time
+                now = reader.timeline.time_offset + engine_time
+                if state["start"] is None:
+                    state["start"] = now
+                run_ticks(now)
+                # Every line moves engine time, like _set_engine_time does for each chunk the live reader reads.
+                # Without this engine_now() and Log_KPM would stand still between counter lines.
+                reader.last_engine_time = line_time
+                clock.now = now
+            if reader.line_filter.search(raw):
+                reader._process_line(raw.decode('utf-8', errors='ignore'))
+
+        if engine_time is not None:
+            run_ticks(reader.timeline.time_offset + engine_time + rate) # Final tick covering the last lines
+    return rows
+
+def merge_original_columns(rows, original_csv):
+    """Forward-fills the TAB/FPS state columns of an original master_run_log.csv into the replayed rows."""
+    with open(original_csv, 'r', newline='', encoding='utf-8') as f:
+        original = list(csv.DictReader(f))
+    if not original:
+        return []
+    columns = [c for c in original[0] if c.startswith(STATE_COLUMN_PREFIXES)]
+
+    idx = 0
+    last = None
+    for row in rows:
+        while idx < len(original) and float(original[idx]["Time"]) <= row["Time"]:
+            last = original[idx]
+            idx += 1
+        for c in columns:
+            row[c] = last[c] if last is not None else 0
+    return columns
+
+def write_master_log(rows, path, settings, extra_columns=()):
+    kpm_col = log_kpm_column(settings.get('log_kpm_rolling', True), settings.get('log_kpm_window', 60))
+    fieldnames = ["Time", "Live", "Spawned", *extra_columns, "Event", kpm_col]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            row = dict(row)
+            row[kpm_col] = row.pop("Log_KPM")
+            writer.writerow(row)
+
+def main():
+    default_settings = os.path.join(os.path.dirname(os.path.abspath(__file__)), "last_run_settings.json")
+    parser = argparse.ArgumentParser(description="Re-run the log analysis of a recorded EE.log (DEBUG_INFO/ee_recording.log.gz) without the game.")
+    parser.add_argument("recording", help="Path to ee_recording.log.gz or ee_recording.lrec (or an uncompressed ee_recording.log of older runs)")
+    parser.add_argument("--settings", default=default_settings, help="Settings JSON (defaults to last_run_settings.json)")
+    parser.add_argument("--out", help="Output CSV (defaults to master_run_log_replay.csv next to the recording)")
+    parser.add_argument("--merge", help="Original master_run_log.csv to copy the Credits/CPM/Kills/FPS columns from")
+    parser.add_argument("--rate", type=int, help="Override data_recording_rate (ms)")
+    parser.add_argument("--window", type=int, help="Override log_kpm_window (s)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rolling", action="store_true", help="Force rolling Log KPM")
+    mode.add_argument("--cumulative", action="store_true", help="Force cumulative Log KPM")
+    parser.add_argument("--mode", choices=["Solo", "Duo"], help="Override squad mode (effigy threshold)")
+    args = parser.parse_args()
+
+    settings = {}
+    if args.settings and os.path.exists(args.settings):
+        with open(args.settings, 'r') as f:
+            settings = json.load(f)
+        print(f"[Replay] Loaded settings: {args.settings}")
+    if args.rate: settings['data_recording_rate'] = args.rate
+    if args.window: settings['log_kpm_window'] = args.window
+    if args.rolling: settings['log_kpm_rolling'] = True
+    if args.cumulative: settings['log_kpm_rolling'] = False
+    if args.mode: settings['mode'] = args.mode
+
+    t0 = time.perf_counter()
+    rows = replay_recording(args.recording, settings)
+    elapsed = time.perf_counter() - t0
+
+    extra_columns = merge_original_columns(rows, args.merge) if args.merge else []
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(args.recording)), "master_run_log_replay.csv")
+    write_master_log(rows, out, settings, extra_columns)
+
+    run_secs = rows[-1]["Time"] if rows else 0.0
+    speedup = run_secs / elapsed if elapsed > 0 else 0.0
+    print(f"[Replay] {len(rows)} rows ({run_secs / 60:.1f} min of run time) in {elapsed:.2f}s ({speedup:,.0f}x real time)")
+    print(f"[Replay] Saved to: {out}")
+
+if __name__ == "__main__":
+    main()
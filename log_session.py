@@ -0,0 +1,129 @@
+from event_bus import EVENT_ACOLYTE, EVENT_ALLIES, EVENT_GENERAL, EVENT_MISSION_START, EVENT_MISSION_END
+
+class LogSession:
+    """Turns LogReader state into the per-tick Live/Spawned/Log_KPM values and events of one run.
+
+    Used by WarframeTracker.update_log_data during a live run and by log_replay.py offline,
+    so a replayed recording produces the same numbers the tracker would have written.
+    """
+    def __init__(self, reader, settings):
+        self.reader = reader
+        self.log_kpm_rolling = settings.get('log_kpm_rolling', True)
+        self.log_kpm_window = settings.get('log_kpm_window', 60)
+        self.acolyte_enabled = settings.get('acolyte_warner_enabled', False)
+        self.effigy_enabled = settings.get('effigy_warner_enabled', False)
+        self.effigy_threshold = 3 if settings.get('mode', 'Solo') == 'Duo' else 1
+
+        self.initial_log_kills = None
+        self.seen_log_resets = reader.resets
+        self.last_log_kills = 0
+        self.last_ally_live = reader.ally_live
+        self.start_engine_time = None # Engine time (reader.engine_now) of the first ready tick
+
+        # A tracker restarted mid-run continues the kill count and KPM of the previous one
+        saved = (reader.restored_checkpoint or {}).get("session")
+        if saved:
+            self.initial_log_kills = saved["initial_log_kills"]
+            self.start_engine_time = saved["start_engine_time"]
+        reader.checkpoint_providers["session"] = self.checkpoint_state
+
+    def checkpoint_state(self):
+        """Session state saved in the reader's checkpoint. Called on the reader thread."""
+        return {"initial_log_kills": self.initial_log_kills, "start_engine_time": self.start_engine_time}
+
+    def poll_events(self):
+        """Drains the reader's event bus and returns what the caller has to act on.
+
+        The tracker calls this as soon as the bus signals a new event, tick() calls it as well
+        so events are never left behind. Returns a dict with lists:
+        'acolytes' (name, duration), 'effigy' (from, to) ally counts and 'events' (Event column strings).
+        """
+        actions = {"acolytes": [], "effigy": [], "events": []}
+        for event in self.reader.events.drain():
+            if event.kind == EVENT_ACOLYTE:
+                if self.acolyte_enabled:
+                    actions["acolytes"].append(event.data)
+                    actions["events"].append(f"{event.data[0]} Spawned")
+            elif event.kind == EVENT_ALLIES:
+                # Effigy Warning: trigger if we drop FROM the active threshold (or higher) TO below it.
+                allies = event.data
+                if self.effigy_enabled and self.last_ally_live >= self.effigy_threshold and allies < self.effigy_threshold:
+                    actions["effigy"].append((self.last_ally_live, allies))
+                self.last_ally_live = allies
+            elif event.kind == EVENT_GENERAL:
+                if event.data == "Log Reset":
+                    self.last_ally_live = 0 # Counters restart with the new file, not an effigy death
+                actions["events"].append(event.data)
+            elif event.kind == EVENT_MISSION_START:
+                self.last_ally_live = 0 # Allies respawn with the new mission, losing them on load is not an effigy death
+                actions["events"].append(f"Mission Start: {event.data}" if event.data else "Mission Start")
+            elif event.kind == EVENT_MISSION_END:
+                actions["events"].append(f"Mission End ({event.data[1]} kills)")
+        return actions
+
+    def run_kills(self):
+        """Kills since the run started, across missions and game restarts. 0 until the first ready tick."""
+        if self.initial_log_kills is None:
+            return 0
+        return max(0, self.reader.kills_total - self.initial_log_kills)
+
+    def tick(self, t):
+        """Advances the session to run time t (minutes) and returns a dict describing this tick.
+
+        t only decides how long to wait for the first counters. Log_KPM is computed from the
+        engine timestamps of the kill changes, not from when the tick happens to run.
+        Contains the poll_events() lists for anything not yet delivered, plus the counters.
+        'ready' is False while we are still waiting for the first valid counters; the caller
+        should then skip writing a row but still handle the warnings and events.
+        """
+        result = self.poll_events()
+        result.update({
+            "live": 0, "spawned": 0, "ally_live": 0,
+            "kills": 0, "kpm": 0.0, "ready": True,
+            "reset_carry": None, # Kills carried over if EE.log was reset since the last tick
+        })
+        reader = self.reader
+        live, spawned, ally_live = reader.get_stats()
+
+        # reader.kills_total keeps growing across missions and EE.log resets (game restarts),
+        # the reader moves each finished mission's kills into its baseline before the counters restart.
+        reader_kills = reader.kills_total
+        if reader.resets != self.seen_log_resets:
+            self.seen_log_resets = reader.resets
+            result["reset_carry"] = self.last_log_kills
+        result["live"], result["spawned"], result["ally_live"] = live, spawned, ally_live
+
+        if self.initial_log_kills is None:
+            # Wait briefly for valid data to avoid 0-spike if reader is catching up
+            if (spawned == 0 and live == 0) and t < 0.03:
+                result["ready"] = False
+                return result
+            self.initial_log_kills = reader_kills
+
+        log_calculated_kills = max(0, reader_kills - self.initial_log_kills)
+        self.last_log_kills = log_calculated_kills
+        result["kills"] = log_calculated_kills
+
+        # KPM runs on engine time: a stalled UI thread delays the tick but does not change the rate
+        now = reader.engine_now()
+        if self.start_engine_time is None:
+            self.start_engine_time = now
+        start = self.start_engine_time
+        if self.log_kpm_rolling:
+            start = max(start, now - self.log_kpm_window) # Cumulative until a full window has passed
+        log_calculated_kpm = 0.0
+        elapsed = now - start
+        if elapsed > 1.0:
+            start_kills = max(self.initial_log_kills, reader.timeline.kills_at(start, self.initial_log_kills))
+            log_calculated_kpm = max(0, reader_kills - start_kills) / (elapsed / 60)
+
+        result["kpm"] = log_calculated_kpm
+        return result
+
+def log_kpm_column(rolling, window):
+    """CSV header of the Log_KPM column, including the mode so PB files can be checked for mismatches."""
+    return f"Log_KPM (Rolling {window}s)" if rolling else "Log_KPM (Cumulative)"
+
+def merge_event(pending, event):
+    """Appends an event to the pending Event column value."""
+    return f"{pending} | {event}" if pending else event
@@ -0,0 +1,124 @@
+import os
+import re
+import glob
+import time
+import random
+import argparse
+import tempfile
+
+import cv2 as cv
+import numpy as np
+
+from digit_recognizer import DigitRecognizer, binarize, text_region, scan_text
+
+# Debug images whose name holds the value the tracker read, e.g. SCAN_CREDITS_1234567_AT_3.52m.png
+LABELED_NAME = re.compile(r"SCAN_(CREDITS|KILLS)_(\d+)_AT_", re.IGNORECASE)
+
+# ==========================================
+# Test images
+# ==========================================
+def write_synthetic_boxes(folder, count, seed=1):
+    """Credit box stand-ins: white digits with thousands separators on a dark, noisy background."""
+    rng = random.Random(seed)
+    for i in range(count):
+        value = rng.randint(0, 30_000_000)
+        text = f"{value:,}"
+        scale = rng.uniform(0.9, 1.1)
+        im = np.full((44, 260, 4), 255, dtype=np.uint8)
+        im[:, :, :3] = rng.randint(10, 50)
+        noise = np.random.default_rng(i).integers(0, 40, size=im.shape[:2], dtype=np.uint8)
+        im[:, :, :3] += noise[:, :, None]
+        cv.putText(im, text, (rng.randint(4, 20), 32), cv.FONT_HERSHEY_SIMPLEX, scale, (235, 235, 235, 255), 2, cv.LINE_AA)
+        cv.imwrite(os.path.join(folder, f"SCAN_CREDITS_{value}_AT_{i / 10:.2f}m.png"), im)
+
+def load_labeled(folder):
+    """(name, image, value) of every labeled debug image under folder."""
+    items = []
+    for path in sorted(glob.glob(os.path.join(folder, "**", "*.png"), recursive=True)):
+        m = LABELED_NAME.search(os.path.basename(path))
+        if not m:
+            continue
+        im = cv.imread(path, cv.IMREAD_UNCHANGED)
+        if im is not None:
+            items.append((os.path.basename(path), im, int(m.group(2))))
+    return items
+
+# ==========================================
+# Benchmark
+# ==========================================
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+def bench(items, train_count, easyocr_reader=None):
+    """Learns from the first train_count images, then reads the rest like ocr_function would."""
+    recognizer = DigitRecognizer()
+    train, test = items[:train_count], items[train_count:]
+    learned = sum(recognizer.learn(binarize(im), value) for _, im, value in train)
+    print(f"[Bench] learned from {learned}/{len(train)} images, digits known: {''.join(sorted(recognizer.samples))}")
+
+    fast_ms, correct, wrong, fallback = [], 0, 0, 0
+    for name, im, value in test:
+        t0 = time.perf_counter()
+        result = recognizer.read(binarize(im))
+        fast_ms.append((time.perf_counter() - t0) * 1000)
+        if result is None:
+            fallback += 1
+        elif result[0] == value:
+            correct += 1
+        else:
+            wrong += 1
+            print(f"[Bench] WRONG {name}: read {result[0]} (confidence {result[1]:.2f})")
+    n = max(1, len(test))
+    print(f"[Bench] template reader: {correct}/{len(test)} correct ({correct / n * 100:.1f}%), {wrong} wrong, "
+          f"{fallback} fallbacks ({fallback / n * 100:.1f}%)")
+    print(f"[Bench] template reader latency: median {percentile(fast_ms, 0.5):.2f} ms, p95 {percentile(fast_ms, 0.95):.2f} ms")
+
+    if easyocr_reader is None:
+        return
+    # Full readtext (detector + recognizer) against the recognizer alone on the text line
+    for path in ("readtext", "recognize"):
+        ocr_ms, ocr_correct = [], 0
+        for _, im, value in test:
+            im_thresh = binarize(im)
+            t0 = time.perf_counter()
+            if path == "readtext":
+                scan = easyocr_reader.readtext(im_thresh, allowlist="0123456789, ")
+            else:
+                region = text_region(im_thresh)
+                scan = easyocr_reader.recognize(im_thresh, horizontal_list=[region], free_list=[], allowlist="0123456789, ", detail=1) if region else []
+            ocr_ms.append((time.perf_counter() - t0) * 1000)
+            text = scan_text(scan)
+            ocr_correct += text.isdigit() and int(text) == value
+        print(f"[Bench] EasyOCR {path}: {ocr_correct}/{len(test)} correct ({ocr_correct / n * 100:.1f}%), "
+              f"latency median {percentile(ocr_ms, 0.5):.1f} ms, p95 {percentile(ocr_ms, 0.95):.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy and latency of the template digit reader on DEBUG_INFO scan images")
+    parser.add_argument("folder", nargs="?", help="Run output or DEBUG_INFO folder with SCAN_CREDITS_*/SCAN_KILLS_* images (Debug Mode)")
+    parser.add_argument("--synthetic", type=int, default=300, help="Number of generated images when no folder is given")
+    parser.add_argument("--train", type=float, default=0.2, help="Fraction of the images used for learning the digits")
+    parser.add_argument("--easyocr", action="store_true", help="Also time EasyOCR (full readtext and recognize-only) on the same images")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if not folder:
+            folder = tmp
+            write_synthetic_boxes(folder, args.synthetic)
+        items = load_labeled(folder)
+        if not items:
+            print(f"[Bench] No labeled scan images in {folder}. Enable Debug Mode to collect them.")
+            return
+        print(f"[Bench] {len(items)} labeled images from {folder if args.folder else 'synthetic boxes'}")
+
+        reader = None
+        if args.easyocr:
+            import easyocr as ocr
+            reader = ocr.Reader(['en'], gpu=True)
+        bench(items, max(1, int(len(items) * args.train)), reader)
+
+if __name__ == "__main__":
+    main()
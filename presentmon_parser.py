@@ -0,0 +1,49 @@
+FRAME_COLUMN = b"msbetweenpresents" # Compared lowercase, PresentMon versions differ in case
+
+class PresentMonParser:
+    """Extracts MsBetweenPresents from raw PresentMon CSV output without decoding it to str.
+
+    feed() takes any chunk of bytes (partial lines are kept for the next call) and returns the
+    frame times (ms) of all complete lines in it. Each line is only split up to the wanted column
+    (maxsplit), so the trailing columns are never touched. float() parses the bytes directly.
+    """
+    def __init__(self):
+        self.column = None # Index of MsBetweenPresents, None until the header line arrived
+        self._carry = b""
+
+    def _read_header(self, block):
+        """Looks for the header line in block. Returns the remaining bytes after it, or None if not found yet."""
+        pos = block.lower().find(FRAME_COLUMN)
+        if pos == -1:
+            return None
+        start = block.rfind(b"\n", 0, pos) + 1
+        end = block.find(b"\n", pos)
+        self.column = block.count(b",", start, pos)
+        return block[end + 1:]
+
+    def feed(self, data):
+        buf = self._carry + data if self._carry else data
+        cut = buf.rfind(b"\n") + 1
+        self._carry = buf[cut:]
+        if cut == 0:
+            return []
+        block = buf[:cut]
+
+        if self.column is None:
+            block = self._read_header(block)
+            if not block:
+                return []
+
+        col = self.column
+        lines = block.splitlines()
+        try:
+            frames = [float(line.split(b",", col + 1)[col]) for line in lines if line]
+        except (ValueError, IndexError):
+            # A status message or malformed line somewhere in the chunk (stderr is merged), check each line
+            frames = []
+            for line in lines:
+                try:
+                    frames.append(float(line.split(b",", col + 1)[col]))
+                except (ValueError, IndexError):
+                    pass
+        return [ms for ms in frames if ms > 0]
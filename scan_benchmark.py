@@ -0,0 +1,250 @@
+import os
+import glob
+import time
+import random
+import argparse
+
+import cv2 as cv
+
+from screen_capture import ScreenCapture, ReplaySource
+from scan_reader import ScanReader, align_credit_box
+from digit_recognizer import binarize
+from capture_benchmark import synthetic_desktop, regions_from_config
+from ocr_benchmark import LABELED_NAME, percentile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ==========================================
+# Replayed scenes
+# ==========================================
+def draw_text(image, text, box, scale=0.9):
+    """White text at the left of a (left, top, right, lower) box, like the end-of-mission screen."""
+    left, top, right, lower = box
+    cv.putText(image, text, (left + 6, lower - 8), cv.FONT_HERSHEY_SIMPLEX, scale, (235, 235, 235, 255), 2, cv.LINE_AA)
+
+def synthetic_frames(count, label_index=2, seed=1):
+    """TAB screens of a run: the 'Credits' label over one credit box, rising credits and kills.
+
+    Returns (frames, regions, label coords in scan area, [(credits, kills)] per frame).
+    """
+    rng = random.Random(seed)
+    # Boxes wide enough for eight digit credit counts
+    scan = (300, 100, 1560, 700)
+    credits = [(scan[0] + 20 + i * 250, scan[1] + 200, scan[0] + 250 + i * 250, scan[1] + 244) for i in range(5)]
+    kills = (scan[0] + 20, scan[1] + 320, scan[0] + 250, scan[1] + 364)
+    box = credits[label_index]
+    label = (box[0] + 10, box[1] - 60, box[2] - 10, box[1] - 20)
+    label_coords = (label[0] - scan[0], label[1] - scan[1], label[2] - label[0], label[3] - label[1])
+    frames, truth = [], []
+    value, kill_count = rng.randint(10_000, 200_000), 0
+    for i in range(count):
+        image = synthetic_desktop(seed=i + 1)
+        draw_text(image, "Credits", label)
+        draw_text(image, f"{value:,}", box)
+        draw_text(image, str(kill_count), kills)
+        frames.append(image)
+        truth.append((value, kill_count))
+        value += rng.randint(5_000, 400_000)
+        kill_count += rng.randint(10, 300)
+    return frames, (scan, credits, kills), label_coords, truth
+
+def debug_crops(folder):
+    """Labeled number crops (SCAN_CREDITS_*/SCAN_KILLS_*) from Debug Mode, as (path, value)."""
+    items = []
+    for path in sorted(glob.glob(os.path.join(folder, "**", "*.png"), recursive=True)):
+        m = LABELED_NAME.search(os.path.basename(path))
+        if m:
+            items.append((path, int(m.group(2))))
+    return items
+
+# ==========================================
+# Benchmark
+# ==========================================
+class Timings:
+    def __init__(self):
+        self.ms = {}
+
+    def add(self, stage, t0):
+        self.ms.setdefault(stage, []).append((time.perf_counter() - t0) * 1000)
+
+    def report(self):
+        for stage, values in self.ms.items():
+            print(f"[Bench] {stage:<14} median {percentile(values, 0.5):7.2f} ms, p95 {percentile(values, 0.95):7.2f} ms ({len(values)} calls)")
+
+def accept(scan_reader, result, expected):
+    """Learns an EasyOCR read the way the tracker does once its sanity checks pass, here when it matches the expected value."""
+    if result and result[0] > 0 and result[2] is not None and expected in (None, result[0]):
+        scan_reader.learn_number(result[2], result[0])
+
+def scan_frames(source, scan_reader, regions, truth, passes):
+    """Runs the TAB scan (grab, label, alignment, number reads) on every frame, passes times over."""
+    scan, credits, kills = regions
+    capture = scan_reader.capture
+    bboxes = [scan] + credits + ([kills] if kills else [])
+    timings = Timings()
+    counts = {"label": 0, "credits": 0, "credits wrong": 0, "kills": 0, "kills wrong": 0, "scans": 0}
+    for n in range(passes):
+        for i in range(len(source.frames)):
+            source.index = i
+            counts["scans"] += 1
+            expected_credits, expected_kills = truth[i] if truth else (None, None)
+
+            t0 = time.perf_counter()
+            views = capture.grab_regions(bboxes)
+            timings.add("grab", t0)
+
+            t0 = time.perf_counter()
+            coords = scan_reader.find_credits_coords(views[scan], 1)
+            timings.add("label", t0)
+            if coords:
+                counts["label"] += 1
+                box = align_credit_box(coords, scan[0], credits)
+                t0 = time.perf_counter()
+                result = scan_reader.read_number(views[tuple(box)], "credits")
+                timings.add("credits read", t0)
+                accept(scan_reader, result, expected_credits)
+                if result and result[0] > 0:
+                    counts["credits"] += 1
+                    if expected_credits is not None and result[0] != expected_credits:
+                        counts["credits wrong"] += 1
+                        if n == 0:
+                            print(f"[Bench] WRONG credits in frame {i}: read {result[0]}, expected {expected_credits}")
+
+            if kills:
+                t0 = time.perf_counter()
+                result = scan_reader.read_number(views[kills], "kills")
+                timings.add("kills read", t0)
+                accept(scan_reader, result, expected_kills)
+                if result:
+                    counts["kills"] += 1
+                    if expected_kills is not None and result[0] != expected_kills:
+                        counts["kills wrong"] += 1
+                        if n == 0:
+                            print(f"[Bench] WRONG kills in frame {i}: read {result[0]}, expected {expected_kills}")
+    return timings, counts
+
+def scan_crops(source, scan_reader, sizes, truth, passes):
+    """Reads every debug crop through the capture session like a credit box."""
+    capture = scan_reader.capture
+    timings = Timings()
+    counts = {"read": 0, "wrong": 0, "scans": 0}
+    for _ in range(passes):
+        for i, (width, height) in enumerate(sizes):
+            source.index = i
+            counts["scans"] += 1
+            t0 = time.perf_counter()
+            im = capture.grab((0, 0, width, height), key="number box")
+            timings.add("grab", t0)
+            t0 = time.perf_counter()
+            result = scan_reader.read_number(im)
+            timings.add("number read", t0)
+            accept(scan_reader, result, truth[i])
+            if result and result[0] > 0:
+                counts["read"] += 1
+                if result[0] != truth[i]:
+                    counts["wrong"] += 1
+    return timings, counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and accuracy of the TAB scan on replayed screenshots, no game or Windows needed")
+    parser.add_argument("--screenshot", help="Full-monitor screenshot to replay (default: setup_screenshot_solo.png next to this script)")
+    parser.add_argument("--frames", help="Folder of full-monitor PNGs to replay as a sequence instead of one screenshot")
+    parser.add_argument("--config", help="Bounding box config with the scan regions (default: bbox_config_solo.json next to this script)")
+    parser.add_argument("--origin", type=int, nargs=2, default=(0, 0), metavar=("LEFT", "TOP"), help="Screen position of the screenshots' top-left corner")
+    parser.add_argument("--debug", help="DEBUG_INFO or run folder: read the labeled SCAN_CREDITS_*/SCAN_KILLS_* crops instead")
+    parser.add_argument("--label", type=int, nargs=4, metavar=("X", "Y", "W", "H"), help="'Credits' label in scan area coords, seeds the label cache without EasyOCR")
+    parser.add_argument("--expect", type=int, nargs=2, metavar=("CREDITS", "KILLS"), help="Values every replayed screen should read as")
+    parser.add_argument("--templates", help="Digit templates (default: digit_templates.npz next to this script)")
+    parser.add_argument("--synthetic", type=int, default=60, help="Generated TAB screens when no screenshots are found")
+    parser.add_argument("--train", type=float, default=0.2, help="Fraction of the synthetic screens or debug crops learned first when there are no digit templates")
+    parser.add_argument("--passes", type=int, default=5)
+    parser.add_argument("--easyocr", action="store_true", help="Use EasyOCR for label lookups and unsure reads, as the tracker does")
+    parser.add_argument("--verbose", action="store_true", help="Print the scan reader's log lines")
+    args = parser.parse_args()
+
+    reader = None
+    if args.easyocr:
+        import easyocr as ocr
+        reader = ocr.Reader(['en'], gpu=True)
+    templates = args.templates or os.path.join(BASE_DIR, "digit_templates.npz")
+    log = (lambda message, important=False, is_error=False: print(message)) if args.verbose else (lambda *a, **k: None)
+
+    # --- Debug crops: number reads only ---
+    if args.debug:
+        items = debug_crops(args.debug)
+        if not items:
+            print(f"[Bench] No labeled scan images in {args.debug}. Enable Debug Mode to collect them.")
+            return
+        scan_reader = ScanReader(None, reader, templates, log=log)
+        if not scan_reader.digit_recognizer:
+            # No templates file yet: learn from the first crops, read the rest
+            train = max(1, int(len(items) * args.train))
+            for path, value in items[:train]:
+                scan_reader.digit_recognizer.learn(binarize(cv.imread(path, cv.IMREAD_UNCHANGED)), value)
+            items = items[train:]
+            if not items:
+                print("[Bench] Not enough labeled crops left to read after learning the digits.")
+                return
+        source = ReplaySource([path for path, _ in items])
+        scan_reader.capture = ScreenCapture(source)
+        sizes = []
+        for i in range(len(items)):
+            source.index = i
+            image = source.frame()[0]
+            sizes.append((image.shape[1], image.shape[0]))
+        print(f"[Bench] {len(items)} labeled crops from {args.debug}, digits known: {''.join(sorted(scan_reader.digit_recognizer.samples)) or 'none'}")
+        timings, counts = scan_crops(source, scan_reader, sizes, [value for _, value in items], args.passes)
+        n = max(1, counts["scans"])
+        print(f"[Bench] numbers read: {counts['read']}/{counts['scans']} ({counts['read'] / n * 100:.1f}%), {counts['wrong']} wrong")
+        timings.report()
+        return
+
+    # --- Full TAB screens ---
+    screenshot = args.screenshot or os.path.join(BASE_DIR, "setup_screenshot_solo.png")
+    config = args.config or os.path.join(BASE_DIR, "bbox_config_solo.json")
+    paths = sorted(glob.glob(os.path.join(args.frames, "*.png"))) if args.frames else ([screenshot] if os.path.exists(screenshot) else [])
+    truth = None
+    label_coords = tuple(args.label) if args.label else None
+    if paths and os.path.exists(config):
+        source = ReplaySource(paths, *args.origin)
+        regions = regions_from_config(config)
+        if args.expect:
+            truth = [tuple(args.expect)] * len(paths)
+        print(f"[Bench] replaying {len(paths)} screenshot(s), regions from {os.path.basename(config)}")
+        scan_reader = ScanReader(ScreenCapture(source), reader, templates, log=log)
+    else:
+        frames, regions, synthetic_label, truth = synthetic_frames(args.synthetic)
+        label_coords = label_coords or synthetic_label
+        train = max(1, int(len(frames) * args.train))
+        source = ReplaySource(frames[train:])
+        print(f"[Bench] no screenshot and config found, replaying {len(frames) - train} synthetic TAB screens")
+        # Without the real templates file the digits are learned from the first screens, like EasyOCR reads would
+        scan_reader = ScanReader(ScreenCapture(source), reader, args.templates, log=log)
+        scan, credits, kills = regions
+        box = credits[2]
+        for image, (value, kill_count) in zip(frames[:train], truth[:train]):
+            scan_reader.digit_recognizer.learn(binarize(image[box[1]:box[3], box[0]:box[2]]), value)
+            scan_reader.digit_recognizer.learn(binarize(image[kills[1]:kills[3], kills[0]:kills[2]]), kill_count)
+        truth = truth[train:]
+
+    if label_coords:
+        scan = regions[0]
+        scan_reader.credits_locator.learn(1, scan_reader.capture.to_gray(scan_reader.capture.grab(scan, key="label seed"), "label seed"), label_coords)
+    print(f"[Bench] digits known: {''.join(sorted(scan_reader.digit_recognizer.samples)) or 'none'}, "
+          f"label: {'seeded' if label_coords else 'EasyOCR' if reader else 'not available (use --label or --easyocr)'}")
+
+    scan_reader.reset_stats()
+    timings, counts = scan_frames(source, scan_reader, regions, truth, args.passes)
+    n = max(1, counts["scans"])
+    print(f"[Bench] label found: {counts['label']}/{counts['scans']} ({counts['label'] / n * 100:.1f}%)")
+    print(f"[Bench] credits read: {counts['credits']}/{counts['scans']} ({counts['credits'] / n * 100:.1f}%)"
+          + (f", {counts['credits wrong']} wrong" if truth else ""))
+    if regions[2]:
+        print(f"[Bench] kills read: {counts['kills']}/{counts['scans']} ({counts['kills'] / n * 100:.1f}%)"
+              + (f", {counts['kills wrong']} wrong" if truth else ""))
+    timings.report()
+    for line in scan_reader.summary():
+        print(f"[Bench] {line}")
+
+if __name__ == "__main__":
+    main()
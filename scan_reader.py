@@ -0,0 +1,163 @@
+import time
+import cv2 as cv
+
+from credits_locator import CreditsLabelLocator
+from digit_recognizer import DigitRecognizer, binarize, text_region, scan_text, LEARN_MIN_CONFIDENCE
+
+def print_log(message, important=False, is_error=False):
+    print(message)
+
+def align_credit_box(coords, scan_left, credit_positions):
+    """The configured credit box whose center is closest to the center of the 'Credits' label (scan area coords)."""
+    text_center_x = scan_left + coords[0] + coords[2] / 2
+    best_box = None
+    min_dist = float('inf')
+    for box in credit_positions:
+        box_center_x = box[0] + (box[2] - box[0]) / 2
+        dist = abs(text_center_x - box_center_x)
+        if dist < min_dist:
+            min_dist = dist
+            best_box = box
+    return best_box
+
+class ScanReader:
+    """The image side of a TAB scan: finds the 'Credits' label and reads the numbers in the boxes.
+
+    Has no Qt or Windows dependencies, so scan_benchmark.py can run it on replayed screenshots.
+    reader is an easyocr.Reader; without one only the template paths work (label cache, digits).
+    """
+    def __init__(self, capture, reader=None, digit_templates_path=None, log=print_log):
+        self.capture = capture
+        self.reader = reader
+        self.log = log
+        self.credits_locator = CreditsLabelLocator() # Kept across runs, the label stays where it was
+        self.digit_recognizer = DigitRecognizer(digit_templates_path)
+        self.ocr_times = {"recognize": [], "readtext": []} # ms per EasyOCR number read, by path
+
+    def reset_stats(self):
+        self.credits_locator.reset_stats()
+        self.digit_recognizer.reset_stats()
+        self.ocr_times = {"recognize": [], "readtext": []}
+
+    def find_credits_coords(self, im, area=1):
+        t0 = time.perf_counter()
+        # Convert to gray for OCR
+        im_gray = self.capture.to_gray(im, f"label{area}")
+
+        # Fast path: the label cached by an earlier scan, verified by template matching
+        coords = self.credits_locator.locate(area, im_gray)
+        if coords:
+            self.log(f"[Scan] 'Credits' label matched in area {area} (score {self.credits_locator.last_score:.2f}, {(time.perf_counter() - t0) * 1000:.1f} ms)")
+            return coords
+        if self.reader is None:
+            return None
+
+        # Threshold to isolate white text (Credits label)
+        _, im_thresh = cv.threshold(im_gray, 150, 255, cv.THRESH_BINARY)
+        # Read text without allowlist to find letters
+        results = self.reader.readtext(im_thresh)
+
+        for (bbox, text, prob) in results:
+            if "credits" in text.lower():
+                # bbox is [[x1, y1], [x2, y2], [x3, y3], [x4, y4]]
+                (tl, tr, br, bl) = bbox
+                x = int(tl[0])
+                y = int(tl[1])
+                w = int(tr[0] - tl[0])
+                h = int(bl[1] - tl[1])
+                self.credits_locator.learn(area, im_gray, (x, y, w, h))
+                self.log(f"[Scan] 'Credits' label found by OCR in area {area} ({(time.perf_counter() - t0) * 1000:.0f} ms, template match score was {self.credits_locator.last_score:.2f}). Template cached.")
+                return (x, y, w, h)
+        return None
+
+    def recognize_number(self, im_thresh):
+        """EasyOCR's recognizer on the number box without running the text detector first.
+
+        The box is already a single line of text, so its white pixels are passed as the only
+        region. Returns (results like readtext, milliseconds).
+        """
+        region = text_region(im_thresh)
+        if region is None or self.reader is None:
+            return [], 0.0
+        t0 = time.perf_counter()
+        scan = self.reader.recognize(im_thresh, horizontal_list=[region], free_list=[], allowlist="0123456789, ", detail=1)
+        return scan, (time.perf_counter() - t0) * 1000
+
+    def read_number(self, im, key="number"):
+        """Reads a credit or kill box. Returns (number, confidence, learnable), (0, 0.0, None) on a parse error, None if nothing was read.
+
+        key names the gray buffer of the box ("credits", "kills"). Boxes of different sizes need their own,
+        a shared buffer would be reallocated on every read.
+        learnable is the thresholded box if EasyOCR read it confidently enough to learn its digits from.
+        Pass it to learn_number() once the value has passed the caller's sanity checks.
+        """
+        im = self.capture.to_gray(im, key)
+        # Thresholding to improve accuracy on white text
+        _, im_thresh = cv.threshold(im, 150, 255, cv.THRESH_BINARY)
+
+        # Fast path: glyph templates learned from earlier reads, EasyOCR only when unsure
+        if self.digit_recognizer:
+            t0 = time.perf_counter()
+            fast = self.digit_recognizer.read(im_thresh)
+            if fast:
+                num, confidence = fast
+                self.log(f"  [OCR] Template read: {num} (confidence {confidence:.2f}, {(time.perf_counter() - t0) * 1000:.1f} ms)")
+                return num, confidence, None
+
+        scan, ocr_ms = self.recognize_number(im_thresh)
+        if scan_text(scan).isdigit():
+            self.ocr_times["recognize"].append(ocr_ms)
+            self.log(f"  [OCR] Recognized {scan_text(scan)} without text detection ({ocr_ms:.0f} ms)")
+        elif self.reader is not None and cv.countNonZero(im_thresh):
+            # Recognizer alone couldn't make sense of the box, let the detector find the text first
+            t0 = time.perf_counter()
+            scan = self.reader.readtext(im_thresh, allowlist="0123456789, ")
+            readtext_ms = (time.perf_counter() - t0) * 1000
+            self.ocr_times["readtext"].append(readtext_ms)
+            self.log(f"  [OCR] Recognize-only read failed ({ocr_ms:.0f} ms), full readtext: '{scan_text(scan)}' ({readtext_ms:.0f} ms)")
+
+        if len(scan) == 0:
+            return None
+
+        try:
+            # Join all detected text segments (fixes issues where "1 000" is split)
+            num = int(scan_text(scan))
+            # Average confidence
+            confidence = sum([x[2] for x in scan]) / len(scan)
+            return num, confidence, im_thresh if confidence >= LEARN_MIN_CONFIDENCE else None
+        except Exception as e:
+            self.log(f"[OCR] Parse Error: {e} | Raw Scan: {scan}", is_error=True)
+            return 0, 0.0, None
+
+    def learn_number(self, im_thresh, num):
+        """Learns the digits of a box read by EasyOCR, once the caller has accepted the value.
+
+        Templates are saved across runs, so a misread caught by the sanity checks must never get here.
+        """
+        return self.digit_recognizer.learn(im_thresh, num)
+
+    def learn_digits(self, img, boxes, origin=(0, 0)):
+        """Learns digit templates from the numbers EasyOCR reads in boxes (screen coords) of img taken at origin."""
+        mx, my = origin
+        learned = 0
+        for l, t, r, b in boxes:
+            if l < mx or t < my:
+                continue
+            crop = img[t - my:b - my, l - mx:r - mx]
+            if crop.size == 0:
+                continue
+            im_thresh = binarize(crop)
+            scan, _ = self.recognize_number(im_thresh)
+            text = scan_text(scan)
+            if text.isdigit() and min(x[2] for x in scan) >= LEARN_MIN_CONFIDENCE:
+                learned += self.digit_recognizer.learn(im_thresh, int(text))
+        return learned
+
+    def summary(self, labels=True):
+        """Run-end lines for the runtime log, without the label lookups if credits weren't scanned."""
+        lines = [f"'Credits' label lookups: {self.credits_locator.summary()}"] if labels else []
+        lines.append(f"Number reads: {self.digit_recognizer.summary()}")
+        for path, times in self.ocr_times.items():
+            if times:
+                lines.append(f"EasyOCR {path}: {len(times)} reads, median {sorted(times)[len(times) // 2]:.0f} ms, max {max(times):.0f} ms")
+        return lines
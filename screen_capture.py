@@ -0,0 +1,146 @@
+import threading
+import cv2 as cv
+import numpy as np
+import mss
+
+# ==========================================
+# Capture sources
+# ==========================================
+# A capture source provides monitors() (mss style list, [0] = all, [1:] = each monitor),
+# grab(left, top, width, height) -> (height, width, 4) BGRA array and close().
+class MssSource:
+    """The live desktop through mss.
+
+    mss instances hold GDI handles that only work in the thread that created them, so each
+    thread (GUI for the monitor list, the TAB scan worker for grabs) gets its own, created once.
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+        return sct
+
+    def monitors(self):
+        return self._sct().monitors
+
+    def grab(self, left, top, width, height):
+        """BGRA pixels of the rectangle as an (height, width, 4) array over mss's own buffer."""
+        shot = self._sct().grab({"left": left, "top": top, "width": width, "height": height})
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        """Closes the calling thread's mss instance."""
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+class ReplaySource:
+    """Saved screenshots in place of the desktop, for running the scan pipeline without the game.
+
+    frames are images or PNG paths (setup_screenshot_*.png, DEBUG_INFO images, recorded frames).
+    A frame is placed with its top-left corner at (left, top) on the virtual screen, or at its own
+    position when given as (image or path, left, top), e.g. a debug crop at its region.
+    grab() serves the current frame; next_frame() moves on, looping back after the last one.
+    Pixels outside the frame are black, and every grab returns new memory like mss does.
+    """
+    def __init__(self, frames, left=0, top=0):
+        self.frames = [f if isinstance(f, tuple) else (f, left, top) for f in frames]
+        if not self.frames:
+            raise ValueError("ReplaySource needs at least one frame")
+        self.index = 0
+        self._loaded = (None, None) # (index, BGRA image), only the current frame is kept
+
+    def frame(self):
+        """(BGRA image, left, top) of the current frame."""
+        image, left, top = self.frames[self.index]
+        if self._loaded[0] != self.index:
+            if isinstance(image, str):
+                path = image
+                image = cv.imread(path, cv.IMREAD_UNCHANGED)
+                if image is None:
+                    raise FileNotFoundError(f"Could not read replay frame {path}")
+            if image.ndim == 2:
+                image = cv.cvtColor(image, cv.COLOR_GRAY2BGRA)
+            elif image.shape[2] == 3:
+                image = cv.cvtColor(image, cv.COLOR_BGR2BGRA)
+            self._loaded = (self.index, image)
+        return self._loaded[1], left, top
+
+    def next_frame(self):
+        self.index = (self.index + 1) % len(self.frames)
+
+    def monitors(self):
+        image, left, top = self.frame()
+        monitor = {"left": left, "top": top, "width": image.shape[1], "height": image.shape[0]}
+        return [monitor, monitor]
+
+    def grab(self, left, top, width, height):
+        image, frame_left, frame_top = self.frame()
+        out = np.zeros((height, width, 4), dtype=np.uint8)
+        out[:, :, 3] = 255
+        # Overlap of the requested rectangle with the frame, in screen coordinates
+        x0, y0 = max(left, frame_left), max(top, frame_top)
+        x1 = min(left + width, frame_left + image.shape[1])
+        y1 = min(top + height, frame_top + image.shape[0])
+        if x1 > x0 and y1 > y0:
+            out[y0 - top:y1 - top, x0 - left:x1 - left] = image[y0 - frame_top:y1 - frame_top, x0 - frame_left:x1 - frame_left]
+        return out
+
+    def close(self):
+        pass
+
+# ==========================================
+# Capture session
+# ==========================================
+class ScreenCapture:
+    """Long-lived capture for the scan regions.
+
+    Frames are copied into preallocated buffers that are reused while the region size stays the
+    same, and BGRA->gray conversion writes into reused buffers as well. Buffers belong to the
+    calling thread, so a scan running on the hotkey thread never sees another thread's pixels.
+    Returned arrays stay valid until the same thread grabs or converts with the same key again.
+    """
+    def __init__(self, source=None):
+        self.source = source or MssSource()
+        self._local = threading.local()
+
+    def _buffer(self, key, shape):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buf = buffers.get(key)
+        if buf is None or buf.shape != shape:
+            buf = buffers[key] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def monitors(self):
+        return self.source.monitors()
+
+    def grab(self, bbox, key="frame"):
+        """Pixels of bbox (left, top, right, lower) as BGRA, in the reused buffer for key."""
+        left, top, right, lower = bbox
+        frame = self._buffer(key, (lower - top, right - left, 4))
+        np.copyto(frame, self.source.grab(left, top, right - left, lower - top))
+        return frame
+
+    def grab_regions(self, bboxes, key="regions"):
+        """Grabs the union of the bboxes once and returns {bbox: view into that frame}, no copies per region."""
+        left = min(b[0] for b in bboxes)
+        top = min(b[1] for b in bboxes)
+        right = max(b[2] for b in bboxes)
+        lower = max(b[3] for b in bboxes)
+        frame = self.grab((left, top, right, lower), key)
+        return {b: frame[b[1] - top:b[3] - top, b[0] - left:b[2] - left] for b in bboxes}
+
+    def to_gray(self, im, key):
+        """BGRA->gray of im (may be a view) into the reused gray buffer for key."""
+        gray = self._buffer(("gray", key), im.shape[:2])
+        return cv.cvtColor(im, cv.COLOR_BGRA2GRAY, dst=gray)
+
+    def close(self):
+        self._local.buffers = {}
+        self.source.close()
@@ -442,6 +442,19 @@ class SettingsDialog(QtWidgets.QDialog):
         self.check_fps.setChecked(False)
         self.check_fps.setToolTip("Tracks Frames Per Second using PresentMon.exe.<br><b>Requires the tracker to be run as Administrator.</b>")
         layout_track.addWidget(self.check_fps)
+
+        hitch_row = QtWidgets.QWidget()
+        hitch_layout = QtWidgets.QHBoxLayout(hitch_row)
+        hitch_layout.setContentsMargins(0, 0, 0, 0)
+        hitch_layout.addWidget(QtWidgets.QLabel("Hitch Threshold:"))
+        self.spin_hitch_threshold = QtWidgets.QDoubleSpinBox()
+        self.spin_hitch_threshold.setRange(2.0, 20.0)
+        self.spin_hitch_threshold.setSingleStep(0.5)
+        self.spin_hitch_threshold.setValue(4.0)
+        self.spin_hitch_threshold.setSuffix(" x median")
+        self.spin_hitch_threshold.setToolTip("A frame that takes this many times longer than the median frame (and at least 50 ms) is logged as a hitch.<br>Hitches show up in the Event column, in hitches.csv and on the FPS plot.")
+        hitch_layout.addWidget(self.spin_hitch_threshold)
+        layout_track.addWidget(hitch_row)
         
         layout_track.addStretch()
         self.tabs.addTab(tab_tracking, "Tracking")
@@ -644,13 +657,27 @@ class SettingsDialog(QtWidgets.QDialog):
         self.check_debug.setChecked(False)
         self.check_debug.setToolTip("Enables detailed logging. Saves screenshots of OCR warnings/failures and a copy of the game's EE.log for the run inside a 'DEBUG_INFO' folder.<br>Useful for troubleshooting.<br><b>Requires 'Track Log Data' to be enabled.</b>")
         layout_adv.addWidget(self.check_debug)
+
+        # EE.log recording format (Debug Mode)
+        ee_rec_row = QtWidgets.QWidget()
+        ee_rec_layout = QtWidgets.QHBoxLayout(ee_rec_row)
+        ee_rec_layout.setContentsMargins(0, 0, 0, 0)
+        ee_rec_layout.addWidget(QtWidgets.QLabel("EE.log Recording:"))
+        self.combo_ee_recording = QtWidgets.QComboBox()
+        self.combo_ee_recording.addItem("Full (gzip)", "full")
+        self.combo_ee_recording.addItem("Tracked lines only (compact)", "filtered")
+        self.combo_ee_recording.setToolTip("How Debug Mode records the game's EE.log.<br>• <b>Full:</b> Every line, gzip compressed (ee_recording.log.gz).<br>• <b>Tracked lines only:</b> Only the enemy counter, Acolyte and mission lines plus timestamps (ee_recording.lrec). Many times smaller and still works with log_replay.py.")
+        ee_rec_layout.addWidget(self.combo_ee_recording)
+        layout_adv.addWidget(ee_rec_row)
         
         layout_adv.addStretch()
         self.tabs.addTab(tab_advanced, "Advanced")
         
         self.check_logs.toggled.connect(self.update_rate_state)
+        self.check_debug.toggled.connect(self.update_rate_state)
         self.check_kills.toggled.connect(self.update_rate_state)
         self.check_credits.toggled.connect(self.update_rate_state)
+        self.check_fps.toggled.connect(self.update_rate_state)
         self.update_rate_state()
 
         # --- Bottom Buttons ---
@@ -808,7 +835,8 @@ class SettingsDialog(QtWidgets.QDialog):
             "setup_screenshot_solo.png",
             "setup_screenshot_duo.png",
             "profiles.json",
-            "overlay_positions.json"
+            "overlay_positions.json",
+            "digit_templates.npz"
         ]
         
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -852,6 +880,7 @@ class SettingsDialog(QtWidgets.QDialog):
         self.btn_conf_effigy.setEnabled(log_tracking_enabled and self.check_effigy.isChecked())
         self.check_add_log_kpm.setEnabled(log_tracking_enabled)
         self.check_debug.setEnabled(log_tracking_enabled)
+        self.combo_ee_recording.setEnabled(log_tracking_enabled and self.check_debug.isChecked())
         if not log_tracking_enabled:
             self.check_debug.setChecked(False)
             self.check_acolyte.setChecked(False)
@@ -875,6 +904,7 @@ class SettingsDialog(QtWidgets.QDialog):
         
         enabled = self.check_logs.isChecked() or self.check_fps.isChecked()
         self.log_rate_container.setEnabled(enabled)
+        self.spin_hitch_threshold.setEnabled(self.check_fps.isChecked())
 
     def browse_output_folder(self):
         d = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Output Folder", self.line_path.text())
@@ -1108,6 +1138,7 @@ class SettingsDialog(QtWidgets.QDialog):
         self.combo_kpm_mode.setCurrentIndex(1 if data.get("log_kpm_rolling", True) else 0)
         self.spin_kpm_window.setValue(data.get("log_kpm_window", 60))
         self.check_fps.setChecked(data.get("track_fps", False))
+        self.spin_hitch_threshold.setValue(data.get("fps_hitch_threshold", 4.0))
         self.check_overlay.setChecked(data.get("use_overlay", False))
         self.check_acolyte.setChecked(data.get("acolyte_warner_enabled", False))
         if "acolyte_config" in data:
@@ -1136,6 +1167,12 @@ class SettingsDialog(QtWidgets.QDialog):
                 self.combo_rec_rate.setCurrentIndex(i)
                 break
         
+        saved_ee_recording = data.get("ee_recording_mode", "full")
+        for i in range(self.combo_ee_recording.count()):
+            if self.combo_ee_recording.itemData(i) == saved_ee_recording:
+                self.combo_ee_recording.setCurrentIndex(i)
+                break
+        
         saved_rate = data.get("log_update_rate", 0.1)
         for i in range(self.combo_log_rate.count()):
             if QtCore.qFuzzyCompare(self.combo_log_rate.itemData(i), saved_rate):
@@ -1178,6 +1215,7 @@ class SettingsDialog(QtWidgets.QDialog):
             "always_on_top": self.check_on_top.isChecked(),
             "use_sound": self.check_sound.isChecked(),
             "debug_mode": self.check_debug.isChecked(),
+            "ee_recording_mode": self.combo_ee_recording.currentData(),
             "sound_config": self.sound_config,
             "plot_config": current_plot_config,
             "track_logs": self.check_logs.isChecked(),
@@ -1185,6 +1223,7 @@ class SettingsDialog(QtWidgets.QDialog):
             "log_kpm_rolling": (self.combo_kpm_mode.currentIndex() == 1),
             "log_kpm_window": self.spin_kpm_window.value(),
             "track_fps": self.check_fps.isChecked(),
+            "fps_hitch_threshold": self.spin_hitch_threshold.value(),
             "use_overlay": self.check_overlay.isChecked(),
             "overlay_config": self.overlay_config,
             "acolyte_warner_enabled": self.check_acolyte.isChecked(),
@@ -6,14 +6,11 @@ import json
 import winsound
 import threading
 import warnings
-import shutil
 import ctypes
 from datetime import datetime
 import easyocr as ocr
 import cv2 as cv
-import mss
 import keyboard as key
-import numpy as np
 import pydirectinput
 import pandas as pd
 import pyqtgraph as pg
@@ -23,7 +20,11 @@ from pyqtgraph.Qt import QtWidgets, QtCore, QtGui
 import pygame
 
 from log_reader import LogReader
-from fps_tracker import FPSTracker
+from log_recording import GzipRecordingSink, FilteredRecordingSink
+from log_session import LogSession, log_kpm_column, merge_event
+from fps_tracker import FPSTracker, HITCH_THRESHOLD
+from screen_capture import ScreenCapture
+from scan_reader import ScanReader, align_credit_box
 from gui_components import LargeNumberAxisItem, OverlayWindow, DraggableNumberOverlay, AcolyteWarner
 from settings_dialog import SettingsDialog
 
@@ -141,6 +142,7 @@ class WarframeTracker(QtCore.QObject):
     sig_update_overlay_data = QtCore.pyqtSignal(dict)
     sig_ability_warning = QtCore.pyqtSignal()
     sig_ability_restored = QtCore.pyqtSignal()
+    sig_log_events = QtCore.pyqtSignal() # Emitted from the LogReader thread whenever its event bus has news
 
     def __init__(self, settings, dialog_instance= None):
         super().__init__() #initializing the QObject parent class
@@ -170,26 +172,26 @@ class WarframeTracker(QtCore.QObject):
         self.state_log_kpm = 0
         self.state_fps = 0
         self.pending_event = ""
+        self.hitch_log = [] # FPS hitches of the current run, see _collect_hitches
         self.tab_held = False
         
         self.track_logs = self.settings.get('track_logs', False)
         self.acolyte_warner = None
         self.effigy_warner = None
         self.overlay_positions_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "overlay_positions.json")
+        self.log_checkpoint_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "log_checkpoint.json")
         self.pb_data = None # DataFrame for Personal Best
         self.is_effigy_dead = False
-        self.last_ally_live = 0
         self.log_reader = None
+        self.log_session = None
         self.log_file = None
         self.debug_dir = None
         self.ee_log_path = os.path.expandvars(r"%LOCALAPPDATA%\Warframe\EE.log")
-        self.ee_log_start_offset = None
         
         self.results_win = None
         self.fps_tracker = FPSTracker()
         self.log_timer = QtCore.QTimer()
         self.log_timer.timeout.connect(self.update_log_data)
-        self.initial_log_kills = None
         self.sig_start_log_timer.connect(self._start_log_timer_slot)
         self.sig_stop_log_timer.connect(self._stop_log_timer_slot)
         self.request_run_end.connect(self.run_end)
@@ -197,6 +199,7 @@ class WarframeTracker(QtCore.QObject):
         self.sig_update_overlay_data.connect(self._update_overlay_slot)
         self.sig_ability_warning.connect(self.trigger_ability_warning)
         self.sig_ability_restored.connect(self.clear_ability_warning)
+        self.sig_log_events.connect(self._on_log_events)
         self.data_updated.connect(self.update_plot)
         self.request_overlay_toggle.connect(self.toggle_overlay)
         
@@ -214,8 +217,11 @@ class WarframeTracker(QtCore.QObject):
                 primary_x, primary_y = m.x, m.y
                 break
                 
-        self.monitor = mss.mss().monitors[1] # Fallback
-        for m in mss.mss().monitors[1:]:
+        self.capture = ScreenCapture() # One capture session for the whole app, see screen_capture.py
+        self.scan_reader = ScanReader(self.capture, self.reader, os.path.join(os.path.dirname(os.path.abspath(__file__)), "digit_templates.npz"), log=self.log)
+        monitors = self.capture.monitors()
+        self.monitor = monitors[1] # Fallback
+        for m in monitors[1:]:
             if m["left"] == primary_x and m["top"] == primary_y:
                 self.monitor = m
                 break
@@ -255,11 +261,9 @@ class WarframeTracker(QtCore.QObject):
             elapsed = current_time - self.start_time
             run_time_str = f" [T+{elapsed:.3f}s]"
 
-        if self.track_logs and self.log_reader and self.ee_log_start_offset is not None:
-            curr = self.log_reader.current_offset
-            if curr >= self.ee_log_start_offset:
-                rel = curr - self.ee_log_start_offset
-                offset_str = f" [LogOff: {rel}]"
+        if self.track_logs and self.log_reader and self.log_reader.recorder:
+            # Offset into the EE.log recording of this run
+            offset_str = f" [LogOff: {self.log_reader.recorder.bytes_written}]"
             
             # Add Game Engine Timestamp if available
             if hasattr(self.log_reader, 'last_engine_time') and self.log_reader.last_engine_time > 0:
@@ -292,7 +296,6 @@ class WarframeTracker(QtCore.QObject):
         self.last_tab_time = 0.0 
         self.time_credits = []
         self.time_kills = []
-        self.log_kill_history = []
         
         # Scan Area Defaults
         self.scan_left = self.monitor["left"] + int(self.monitor["width"] * 30 / 100)
@@ -321,6 +324,7 @@ class WarframeTracker(QtCore.QObject):
         self.log_kpm_rolling = self.settings.get('log_kpm_rolling', True)
         self.log_kpm_window = self.settings.get('log_kpm_window', 60)
         self.track_fps = self.settings.get('track_fps', False)
+        self.fps_tracker.hitch_threshold = self.settings.get('fps_hitch_threshold', HITCH_THRESHOLD)
         self.log_update_rate = self.settings.get('log_update_rate', 0.1)
         self.data_recording_interval_ms = self.settings.get('data_recording_rate', 100)
         self.show_pb_live = self.settings.get('show_pb_live', True)
@@ -364,6 +368,7 @@ class WarframeTracker(QtCore.QObject):
             if reply == QtWidgets.QMessageBox.No:
                 sys.exit(0)
 
+        self.learn_digits_from_setup_screenshot(application_path)
         
         #Setup the Live GUI (Must be on the main thread)
         print("[DEBUG] Initializing main Graph Window...")
@@ -781,6 +786,7 @@ class WarframeTracker(QtCore.QObject):
             self.scan_top = data['scan_area'][1]
             self.scan_right = data['scan_area'][2]
             self.scan_lower = data['scan_area'][3]
+            self.scan_reader.credits_locator.forget() # Cached label positions are relative to the old scan areas
 
             if data.get('scan_area_2'):
                 self.scan_left_2 = data['scan_area_2'][0]
@@ -969,9 +975,6 @@ class WarframeTracker(QtCore.QObject):
         self.cpm = []
         self.time_credits = []
         self.time_kills = []
-        self.log_kill_history = []
-        self.initial_log_kills = None
-        self.ee_log_start_offset = None
         
         # Reset Master Log
         self.master_log = []
@@ -990,7 +993,6 @@ class WarframeTracker(QtCore.QObject):
         self.state_fps = 0
         self.pending_event = "Start"
         self.is_effigy_dead = False
-        self.last_ally_live = 0
         
         # Clear PB Curves (in case they were shown in a previous run)
         if hasattr(self, 'curve_cpm_pb'):
@@ -1024,6 +1026,7 @@ class WarframeTracker(QtCore.QObject):
         if self.track_fps:
             self.plot_data_fps = {"t": [], "y": []}
             self.curve_fps.setData([], [])
+            self.hitch_log = [] # (run time s, frame ms, median ms)
 
         try:
             timestamp = datetime.now().strftime('%Y-%m-%d %H-%M-%S')
@@ -1110,23 +1113,34 @@ class WarframeTracker(QtCore.QObject):
             self.run_output_path = os.path.dirname(os.path.abspath(__file__))
         
         self.log("[Run] Timer started at 0.0.")
+        self.scan_reader.reset_stats()
         
         if self.track_fps:
             self.fps_tracker.start()
         
         if self.track_logs:
-            self.log_reader = LogReader(self.ee_log_path)
-            self.log_reader.start()
-            self.sig_start_log_timer.emit() # Update every 1 second
-            
-            if self.debug_mode and os.path.exists(self.ee_log_path):
+            self.log_reader = LogReader(self.ee_log_path, checkpoint_path=self.log_checkpoint_file)
+            self.log_session = LogSession(self.log_reader, self.settings)
+            if self.log_reader.restored_checkpoint:
+                live, spawned, _ = self.log_reader.get_stats()
+                self.log(f"[Run] Resuming log tracking from the previous session's checkpoint (Live {live}, Spawned {spawned}, {self.log_reader.kills_total} log kills).", important=True)
+            # Queued across threads: acolyte/effigy warnings fire as soon as the line is parsed
+            self.log_events_callback = self.sig_log_events.emit
+            self.log_reader.events.subscribe(self.log_events_callback)
+            if self.debug_mode and self.debug_dir:
+                # The reader writes what it reads straight into the recording, nothing to copy at run end
                 try:
-                    with open(self.ee_log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        f.seek(0, os.SEEK_END)
-                        self.ee_log_start_offset = f.tell()
-                    self.log(f"[Debug] EE.log start offset marked at: {self.ee_log_start_offset}")
+                    if self.settings.get('ee_recording_mode', 'full') == 'filtered':
+                        dest_log = os.path.join(self.debug_dir, "ee_recording.lrec")
+                        self.log_reader.recorder = FilteredRecordingSink(dest_log)
+                    else:
+                        dest_log = os.path.join(self.debug_dir, "ee_recording.log.gz")
+                        self.log_reader.recorder = GzipRecordingSink(dest_log)
+                    self.log(f"[Debug] Recording EE.log to: {dest_log}")
                 except Exception as e:
-                    self.log(f"[Debug] Failed to mark EE.log start: {e}", is_error=True)
+                    self.log(f"[Debug] Failed to start EE.log recording: {e}", is_error=True)
+            self.log_reader.start()
+            self.sig_start_log_timer.emit() # Update every 1 second
         
         # Always start the timer now to record FPS even if logs are off
         self.sig_start_log_timer.emit()
@@ -1169,24 +1183,24 @@ class WarframeTracker(QtCore.QObject):
         if self.effigy_warner:
             self.effigy_warner.stop_warning()
 
-    def find_credits_coords(self, im):
-        # Convert to gray for OCR
-        im_gray = cv.cvtColor(im, cv.COLOR_BGRA2GRAY)
-        # Threshold to isolate white text (Credits label)
-        _, im_thresh = cv.threshold(im_gray, 150, 255, cv.THRESH_BINARY)
-        # Read text without allowlist to find letters
-        results = self.reader.readtext(im_thresh)
-        
-        for (bbox, text, prob) in results:
-            if "credits" in text.lower():
-                # bbox is [[x1, y1], [x2, y2], [x3, y3], [x4, y4]]
-                (tl, tr, br, bl) = bbox
-                x = int(tl[0])
-                y = int(tl[1])
-                w = int(tr[0] - tl[0])
-                h = int(bl[1] - tl[1])
-                return (x, y, w, h)
-        return None
+    def learn_digits_from_setup_screenshot(self, application_path):
+        """Seeds the template digit reader with the numbers visible in the bounding box setup screenshot."""
+        digits = self.scan_reader.digit_recognizer
+        if len(digits.samples) == 10:
+            return
+        screenshot_filename = "setup_screenshot_solo.png" if self.settings['mode'] == "Solo" else "setup_screenshot_duo.png"
+        img = cv.imread(os.path.join(application_path, screenshot_filename), cv.IMREAD_UNCHANGED)
+        if img is None:
+            return
+
+        # The screenshot covers the monitor, the boxes are in screen coordinates
+        mx, my = self.monitor["left"], self.monitor["top"]
+        boxes = list(self.credit_positions) + list(self.credit_positions_2)
+        if self.track_kills:
+            boxes.append((self.left_kills, self.top_kills, self.right_kills, self.lower_kills))
+        learned = self.scan_reader.learn_digits(img, boxes, (mx, my))
+        digits.save()
+        print(f"[Init] Learned digit templates from {learned} numbers in {screenshot_filename}. Digits known: {''.join(sorted(digits.samples)) or 'none'}")
 
     def on_tab_press(self, event):
         if self.tab_held:
@@ -1234,9 +1248,22 @@ class WarframeTracker(QtCore.QObject):
                 pass
         
         # --- 1. Capture & Validate ---
-        # Capture Scan Area first to check for menu presence
+        # One grab covering every region the scan may need, so they all come from the same frame
         scan_bbox = (self.scan_left, self.scan_top, self.scan_right, self.scan_lower)
-        im_scan = self.screenshot(bbox=scan_bbox)
+        has_scan_2 = hasattr(self, 'scan_left_2') and self.scan_left_2 > 0
+        scan_bbox_2 = (self.scan_left_2, self.scan_top_2, self.scan_right_2, self.scan_lower_2) if has_scan_2 else None
+        bbox_kills = (self.left_kills, self.top_kills, self.right_kills, self.lower_kills) if self.track_kills and not self.track_logs else None
+        regions = [scan_bbox]
+        if self.track_credits:
+            regions += [tuple(box) for box in self.credit_positions]
+            if has_scan_2:
+                regions += [scan_bbox_2] + [tuple(box) for box in self.credit_positions_2]
+        if bbox_kills:
+            regions.append(bbox_kills)
+        t0 = time.perf_counter()
+        views = self.capture.grab_regions(regions)
+        self.log(f"[Scan] Captured {len(views)} regions in one grab ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        im_scan = views[scan_bbox]
         
         best_box = None
         coords = None
@@ -1244,13 +1271,12 @@ class WarframeTracker(QtCore.QObject):
         current_scan_left = self.scan_left
         
         if self.track_credits:
-            coords = self.find_credits_coords(im_scan)
+            coords = self.scan_reader.find_credits_coords(im_scan)
             
             # If not found in Area 1, try Area 2 if configured
-            if not coords and hasattr(self, 'scan_left_2') and self.scan_left_2 > 0:
-                 scan_bbox_2 = (self.scan_left_2, self.scan_top_2, self.scan_right_2, self.scan_lower_2)
-                 im_scan_2 = self.screenshot(bbox=scan_bbox_2)
-                 coords = self.find_credits_coords(im_scan_2)
+            if not coords and has_scan_2:
+                 im_scan_2 = views[scan_bbox_2]
+                 coords = self.scan_reader.find_credits_coords(im_scan_2, area=2)
                  if coords:
                      active_credit_positions = self.credit_positions_2
                      current_scan_left = self.scan_left_2
@@ -1258,17 +1284,7 @@ class WarframeTracker(QtCore.QObject):
 
             if coords:
                 # Calculate alignment to find the correct number box
-                text_abs_x = current_scan_left + coords[0]
-                text_width = coords[2]
-                text_center_x = text_abs_x + (text_width / 2)
-                
-                min_dist = float('inf')
-                for box in active_credit_positions:
-                    box_center_x = box[0] + (box[2] - box[0]) / 2
-                    dist = abs(text_center_x - box_center_x)
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_box = box
+                best_box = align_credit_box(coords, current_scan_left, active_credit_positions)
                 
                 if not best_box:
                     self.log(f"[Scan] ERROR: 'Credits' text found at {coords}, but does not align with any configured credit box.", is_error=True)
@@ -1287,17 +1303,16 @@ class WarframeTracker(QtCore.QObject):
                     self.log(f"Saved debug image: {filename}")
                 return
 
-        # --- 2. Capture Data Images ---
-        # Now that we know the menu is open, capture the specific data boxes immediately.
+        # --- 2. Data Images ---
+        # Views into the same grab, taken while the menu was verified to be open
         
         im_credits_val = None
         if self.track_credits and best_box:
-            im_credits_val = self.screenshot(bbox=tuple(best_box))
+            im_credits_val = views[tuple(best_box)]
             
         im_kills_val = None
-        if self.track_kills and not self.track_logs:
-            bbox_kills = (self.left_kills, self.top_kills, self.right_kills, self.lower_kills)
-            im_kills_val = self.screenshot(bbox=bbox_kills)
+        if bbox_kills:
+            im_kills_val = views[bbox_kills]
 
         # --- 4. Process Data (OCR) ---
         scan_succeeded = False
@@ -1305,12 +1320,14 @@ class WarframeTracker(QtCore.QObject):
         num = 0
         if self.track_credits and im_credits_val is not None:
             # Pass bbox=None to disable retries (since we can't re-screenshot a closed tab)
-            num, confidence, time_cp = self.ocr_function(im_credits_val, bbox=None)
+            num, confidence, time_cp, learnable = self.ocr_function(im_credits_val, bbox=None, key="credits")
+            plausible = True # Only values that pass the safety checks teach the digit reader
 
             # Safety Check: Credits jump > 1,000,000
             if len(self.creds) > 0:
                 diff = num - self.creds[-1]
                 if diff > 1_000_000:
+                    plausible = False
                     self.log(f"[Scan] Warning: Credits jumped by {diff} (Prev: {self.creds[-1]}, New: {num}).", important=True)
                     if self.debug_mode and self.debug_dir:
                         filename = f"CREDIT_JUMP_WARNING_AT_{time_mins:.2f}m.png"
@@ -1360,6 +1377,11 @@ class WarframeTracker(QtCore.QObject):
                 self.time_credits.append(time_mins)
                 self.state_credits = num
                 self.state_cpm = int(cpm_value)
+                if learnable is not None and plausible:
+                    self.scan_reader.learn_number(learnable, num)
+                if self.debug_mode and self.debug_dir:
+                    # Labeled with the value read, ocr_benchmark.py measures the digit reader on these
+                    cv.imwrite(os.path.join(self.debug_dir, f"SCAN_CREDITS_{num}_AT_{time_mins:.2f}m.png"), im_credits_val)
             else:
                 active_win = self.get_active_window_title()
                 self.log(f"[Scan] FAIL: Could not read credit numbers from image. Active Window: '{active_win}'")
@@ -1373,23 +1395,26 @@ class WarframeTracker(QtCore.QObject):
         # --- Kills Logic (OCR) ---
         kills_num = 0
         if self.track_kills:
-            if self.track_logs and self.log_reader:
-                live, spawned, _ = self.log_reader.get_stats()
-                kills_num = max(0, spawned - live)
+            if self.track_logs and self.log_session:
+                # Same count as Log_KPM: survives mission changes and game restarts, unlike Spawned - Live
+                kills_num = self.log_session.run_kills()
                 scan_succeeded = True # Log reading is not an OCR fail state
             elif im_kills_val is not None:
-                kills_num, _, _ = self.ocr_function(im_kills_val, bbox=None)
+                kills_num, _, _, learnable = self.ocr_function(im_kills_val, bbox=None, key="kills")
                 
                 if kills_num == 0 and self.debug_mode and self.debug_dir:
                     filename = f"OCR_KILLS_FAIL_AT_{time_mins:.2f}m.png"
                     path = os.path.join(self.debug_dir, filename)
                     cv.imwrite(path, im_kills_val)
                     self.log(f"Saved debug image: {filename}")
+                elif self.debug_mode and self.debug_dir:
+                    cv.imwrite(os.path.join(self.debug_dir, f"SCAN_KILLS_{kills_num}_AT_{time_mins:.2f}m.png"), im_kills_val)
 
                 # Safety Check: Kills jump > 2,500 (OCR only)
                 if len(self.kills) > 0:
                     diff = kills_num - self.kills[-1]
                     if diff > 2500:
+                        learnable = None
                         self.log(f"[Scan] Warning: Kills jumped by {diff} (Prev: {self.kills[-1]}, New: {kills_num}).", important=True)
                         if self.debug_mode and self.debug_dir:
                             filename = f"KILL_JUMP_WARNING_AT_{time_mins:.2f}m.png"
@@ -1399,6 +1424,8 @@ class WarframeTracker(QtCore.QObject):
             
             if kills_num > 0 and not self.track_logs:
                 scan_succeeded = True
+                if learnable is not None:
+                    self.scan_reader.learn_number(learnable, kills_num)
 
             # Only append and update state if we have a valid number
             # (or if we are using logs where 0 is a valid state)
@@ -1475,44 +1502,29 @@ class WarframeTracker(QtCore.QObject):
         self.data_updated.emit()
 
     def screenshot(self, bbox=None):
-        with mss.mss() as sct:
-            if bbox is None:
-                bbox = (self.scan_left, self.scan_top, self.scan_right, self.scan_lower)
-            im = np.array(sct.grab(bbox))
-        return im
+        # Reused buffer, valid until the next screenshot on this thread
+        if bbox is None:
+            bbox = (self.scan_left, self.scan_top, self.scan_right, self.scan_lower)
+        return self.capture.grab(bbox, key="screenshot")
 
-    def ocr_function(self, im, bbox=None, retries=0):
+    def ocr_function(self, im, bbox=None, retries=0, key="number"):
+        """Returns (number, confidence, time, learnable), see ScanReader.read_number for learnable."""
         if im is None:
-            return 0, 0.0, time.perf_counter() - self.start_time
-        im = cv.cvtColor(im, cv.COLOR_BGRA2GRAY) 
-        # Thresholding to improve accuracy on white text
-        _, im_thresh = cv.threshold(im, 150, 255, cv.THRESH_BINARY)
-        
-        scan = self.reader.readtext(im_thresh, allowlist="0123456789, ")
+            return 0, 0.0, time.perf_counter() - self.start_time, None
+        result = self.scan_reader.read_number(im, key)
         
-        if len(scan) == 0:
+        if result is None:
             if retries < 6 and bbox is not None:
                 self.log(f"  [OCR] Empty scan. Retrying in 0.3s (Attempt {retries + 1}/6)")
                 time.sleep(0.3)
-                return self.ocr_function(self.screenshot(bbox=bbox), bbox=bbox, retries=retries + 1)
+                return self.ocr_function(self.screenshot(bbox=bbox), bbox=bbox, retries=retries + 1, key=key)
             else:
                 self.log("  [OCR] Max retries reached. Returning 0.")
                 # Return zeros so the script doesn't append bad data or crash
-                return 0, 0.0, time.perf_counter() - self.start_time
+                return 0, 0.0, time.perf_counter() - self.start_time, None
         
-        try:
-            # Join all detected text segments (fixes issues where "1 000" is split)
-            full_text = "".join([x[1] for x in scan])
-            clean_text = full_text.replace(",", "").replace(" ", "")
-            
-            num = int(clean_text)
-            # Average confidence
-            confidence = sum([x[2] for x in scan]) / len(scan)
-            time_cp = time.perf_counter() - self.start_time
-            return num, confidence, time_cp 
-        except Exception as e:
-            self.log(f"[OCR] Parse Error: {e} | Raw Scan: {scan}", is_error=True)
-            return 0, 0.0, time.perf_counter() - self.start_time
+        num, confidence, learnable = result
+        return num, confidence, time.perf_counter() - self.start_time, learnable
 
 
     def update_plot(self):
@@ -1535,6 +1547,53 @@ class WarframeTracker(QtCore.QObject):
             limit = min(n_time, n_kpm)
             self.curve_kpm.setData(self.time_kills[:limit], self.kpm[:limit])
 
+    def _on_log_events(self):
+        if self.start_time is None or not self.log_session:
+            return
+        self.apply_log_actions(self.log_session.poll_events())
+
+    def apply_log_actions(self, actions):
+        """Runs the UI side of LogSession events: acolyte/effigy warnings and the Event column."""
+        # Acolyte Warning
+        for name, duration in actions["acolytes"]:
+            if not self.acolyte_warner:
+                break
+            self.log(f"[Tracker] Triggering Acolyte Warner for {name} ({duration}s)!", important=True)
+            acolyte_cfg = self.settings.get("acolyte_config", {})
+            if acolyte_cfg.get("audio_cue", True):
+                # Use a distinct sound for the acolyte
+                # 3 High Beeps or 1 Long Sound
+                def play_acolyte():
+                    for i in range(3):
+                        dur, blocked = self.play_sound_event("acolyte")
+                        if dur > 3.0: break
+                        if not blocked: time.sleep(dur)
+                        if i < 2: time.sleep(0.05)
+                threading.Thread(target=play_acolyte, daemon=True).start()
+            self.acolyte_warner.start_warning(name, duration)
+        
+        # Effigy Warning (Log Based)
+        for prev_allies, allies in actions["effigy"]:
+            self.log(f"[Tracker] Effigy Warning Triggered: Ally count dropped from {prev_allies} to {allies} (Threshold: {self.effigy_threshold}).")
+            self.sig_ability_warning.emit()
+        
+        # Event column (Acolyte Spawn/Death, Log Reset)
+        for event in actions["events"]:
+            self.log(f"[Tracker] Event: {event}", important=True)
+            self.pending_event = merge_event(self.pending_event, event)
+
+    def _collect_hitches(self, run_start):
+        """Moves new FPSTracker hitches into the run's hitch log. Returns the Event column text for them, or None."""
+        hitches = self.fps_tracker.pop_hitches()
+        if not hitches:
+            return None
+        for perf_time, ms, median in hitches:
+            self.hitch_log.append((round(perf_time - run_start, 2), round(ms, 1), round(median, 2)))
+        worst = max(ms for _, ms, _ in hitches)
+        if len(hitches) == 1:
+            return f"Hitch {worst:.0f} ms"
+        return f"Hitch x{len(hitches)} (max {worst:.0f} ms)"
+
     def update_log_data(self):
         if self.start_time is None:
             return
@@ -1544,97 +1603,33 @@ class WarframeTracker(QtCore.QObject):
         t = elapsed_seconds / 60
         
         # Get FPS
+        fps_stats = None
         if self.track_fps:
             try:
                 val = self.fps_tracker.get_fps()
                 if val is not None:
                     self.state_fps = int(val)
+                fps_stats = self.fps_tracker.get_frame_stats()
             except (ValueError, TypeError):
                 pass
+            hitch_event = self._collect_hitches(self.start_time)
+            if hitch_event:
+                self.pending_event = merge_event(self.pending_event, hitch_event)
 
         live, spawned, ally_live = 0, 0, 0
-        if self.track_logs and self.log_reader:
-            live, spawned, ally_live = self.log_reader.get_stats()
-        
-        # Check for Acolyte Warning
-        if self.track_logs and self.log_reader and self.acolyte_warner:
-            acolyte_info = self.log_reader.check_and_clear_acolyte_warning()
-            if acolyte_info:
-                name, duration = acolyte_info
-                self.log(f"[Tracker] Triggering Acolyte Warner for {name} ({duration}s)!", important=True)
-                acolyte_cfg = self.settings.get("acolyte_config", {})
-                if acolyte_cfg.get("audio_cue", True):
-                    # Use a distinct sound for the acolyte
-                    # 3 High Beeps or 1 Long Sound
-                    def play_acolyte():
-                        for i in range(3):
-                            dur, blocked = self.play_sound_event("acolyte")
-                            if dur > 3.0: break
-                            if not blocked: time.sleep(dur)
-                            if i < 2: time.sleep(0.05)
-                    threading.Thread(target=play_acolyte, daemon=True).start()
-                self.acolyte_warner.start_warning(name, duration)
-                if self.pending_event:
-                    self.pending_event += f" | {name} Spawned"
-                else:
-                    self.pending_event = f"{name} Spawned"
-
-        # Check for Effigy Warning (Log Based)
-        if self.track_logs and self.effigy_enabled:
-            # If ally count drops, trigger warning
-            # Logic: Trigger if we drop FROM the active threshold (or higher) TO below it.
-            if self.last_ally_live >= self.effigy_threshold and ally_live < self.effigy_threshold:
-                self.log(f"[Tracker] Effigy Warning Triggered: Ally count dropped from {self.last_ally_live} to {ally_live} (Threshold: {self.effigy_threshold}).")
-                self.sig_ability_warning.emit()
-            self.last_ally_live = ally_live
-
-        # Check for General Log Events (Acolyte Death)
-        if self.track_logs and self.log_reader:
-            log_event = self.log_reader.check_and_clear_general_events()
-            if log_event:
-                self.log(f"[Tracker] Event: {log_event}", important=True)
-                if self.pending_event:
-                    self.pending_event += f" | {log_event}"
-                else:
-                    self.pending_event = log_event
-
-        # Calculate Log Stats (Always if logs are on, for potential extra plot)
-        log_calculated_kills = 0
         log_calculated_kpm = 0.0
-        
-        if self.track_logs:
-             current_mission_kills = max(0, spawned - live)
-             if self.initial_log_kills is None:
-                 # Wait briefly for valid data to avoid 0-spike if reader is catching up
-                 if (spawned == 0 and live == 0) and t < 0.03:
-                     return
-                 self.initial_log_kills = current_mission_kills
-             
-             log_calculated_kills = max(0, current_mission_kills - self.initial_log_kills)
-             
-             if self.log_kpm_rolling:
-                 # Rolling KPM Logic
-                 self.log_kill_history.append((t, log_calculated_kills))
-                 
-                 # Window size in minutes (t is in minutes)
-                 window_min = self.log_kpm_window / 60.0
-                 
-                 # Remove data points older than window
-                 while self.log_kill_history and (t - self.log_kill_history[0][0] > window_min):
-                     self.log_kill_history.pop(0)
-                 
-                 if len(self.log_kill_history) > 1:
-                     dt = t - self.log_kill_history[0][0]
-                     dk = log_calculated_kills - self.log_kill_history[0][1]
-                     if dt > 0.001:
-                         log_calculated_kpm = dk / dt
-                 elif t > 0.017:
-                     # Fallback to cumulative if not enough history yet
-                     log_calculated_kpm = log_calculated_kills / t
-             else:
-                 # Cumulative Logic
-                 if t > 0.017:
-                     log_calculated_kpm = log_calculated_kills / t
+        if self.track_logs and self.log_session:
+            tick = self.log_session.tick(t)
+            live, spawned, ally_live = tick["live"], tick["spawned"], tick["ally_live"]
+            
+            if tick["reset_carry"] is not None:
+                self.log(f"[Tracker] EE.log reset detected. Carrying over {tick['reset_carry']} log kills.", important=True)
+            
+            self.apply_log_actions(tick)
+            
+            if not tick["ready"]:
+                return
+            log_calculated_kpm = tick["kpm"]
 
         self.state_log_kpm = int(log_calculated_kpm)
             
@@ -1665,6 +1660,12 @@ class WarframeTracker(QtCore.QObject):
             row["Tab_KPM"] = self.state_tab_kpm
         if self.track_logs:
             row["Log_KPM"] = int(log_calculated_kpm)
+        if fps_stats:
+            # Rolling over the last FPS_STATS_WINDOW seconds of frames, lows reveal stutter the average hides
+            row["FPS_Median"] = fps_stats["median_fps"]
+            row["FPS_1%_Low"] = fps_stats["low_1_fps"]
+            row["FPS_0.1%_Low"] = fps_stats["low_01_fps"]
+            row["Frametime_Max_ms"] = fps_stats["max_frametime_ms"]
             
         self.master_log.append(row)
         self.pending_event = "" # Reset event after writing
@@ -1721,6 +1722,7 @@ class WarframeTracker(QtCore.QObject):
 
     def run_end(self):
         # Stop accepting new data immediately to prevent race conditions
+        run_start = self.start_time
         self.start_time = None
         
         # Close the live window
@@ -1736,8 +1738,21 @@ class WarframeTracker(QtCore.QObject):
 
         if self.track_logs and self.log_reader:
             self.log_reader.stop()
+            self.log_reader.discard_checkpoint() # Clean end, the next run must not continue this one
+            self.log_reader.events.unsubscribe(self.log_events_callback)
             self.sig_stop_log_timer.emit()
+            count, median_ms, max_ms = self.log_reader.events.latency_stats()
+            self.log(f"[End] Log events: {self.log_reader.events.published} published, {self.log_reader.events.dropped} dropped. Parse-to-delivery latency: median {median_ms:.1f} ms, max {max_ms:.1f} ms (last {count}).")
+            recorder = self.log_reader.recorder
+            if recorder:
+                try:
+                    size_kb = os.path.getsize(recorder.path) / 1024
+                    self.log(f"[Debug] EE.log recording saved: {recorder.bytes_written / 1024:.0f} KB of log in {size_kb:.0f} KB: {recorder.path}")
+                except OSError as e:
+                    self.log(f"[Debug] Failed to save EE.log recording: {e}", is_error=True)
         if self.track_fps:
+            if run_start is not None:
+                self._collect_hitches(run_start) # Hitches since the last log tick
             self.fps_tracker.stop()
 
         # Close Overlays
@@ -1750,27 +1765,6 @@ class WarframeTracker(QtCore.QObject):
             self.effigy_warner.timer.stop()
             self.effigy_warner.close()
         
-        # Save EE.log recording if debug mode
-        if self.track_logs and self.debug_mode and self.ee_log_start_offset is not None and self.debug_dir:
-            try:
-                if os.path.exists(self.ee_log_path):
-                    dest_log = os.path.join(self.debug_dir, "ee_recording.log")
-                    self.log(f"[Debug] Saving EE.log recording to: {dest_log}")
-                    
-                    with open(self.ee_log_path, 'r', encoding='utf-8', errors='ignore') as src:
-                        # Check if file was truncated (game restart)
-                        src.seek(0, os.SEEK_END)
-                        end_pos = src.tell()
-                        
-                        if self.ee_log_start_offset > end_pos:
-                            self.log("[Debug] EE.log seems to have been truncated or rotated. Skipping recording.", is_error=True)
-                        else:
-                            src.seek(self.ee_log_start_offset)
-                            with open(dest_log, 'w', encoding='utf-8') as dst:
-                                shutil.copyfileobj(src, dst)
-            except Exception as e:
-                self.log(f"[Debug] Failed to save EE.log recording: {e}", is_error=True)
-        
         # Save Overlay Positions
         self.save_overlay_positions()
         self.log("[End] Overlay positions saved.")
@@ -1792,7 +1786,7 @@ class WarframeTracker(QtCore.QObject):
 
             # Rename Log_KPM column to include mode info in the CSV header
             if 'Log_KPM' in df_master.columns:
-                new_col_name = f"Log_KPM (Rolling {self.log_kpm_window}s)" if self.log_kpm_rolling else "Log_KPM (Cumulative)"
+                new_col_name = log_kpm_column(self.log_kpm_rolling, self.log_kpm_window)
                 df_master.rename(columns={'Log_KPM': new_col_name}, inplace=True)
             
             df_master.to_csv(save_path, index=False)
@@ -1800,6 +1794,44 @@ class WarframeTracker(QtCore.QObject):
         except Exception as e:
             self.log(f"[End] Error saving Master CSV: {e}", is_error=True)
 
+        spawn_range = None # Engine time range of the spawn composition export, reused by its plot
+        if self.track_logs and self.log_reader:
+            try:
+                timeline = self.log_reader.timeline
+                timeline_path = os.path.join(self.run_output_path, "counter_timeline.csv")
+                timeline.to_csv(timeline_path)
+                self.log(f"[End] Counter timeline saved ({len(timeline)} samples, {timeline.nbytes() / 1024:.0f} KB in memory): {timeline_path}")
+            except Exception as e:
+                self.log(f"[End] Error saving counter timeline: {e}", is_error=True)
+
+            try:
+                spawns = self.log_reader.spawns
+                if spawns.times:
+                    start = self.log_session.start_engine_time
+                    if start is None:
+                        start = min(times[0] for times in spawns.times.values())
+                    spawn_range = (start, self.log_reader.engine_now())
+                    composition_path = os.path.join(self.run_output_path, "spawn_composition.csv")
+                    spawns.to_csv(composition_path, *spawn_range)
+                    top = ", ".join(f"{name} {count}" for name, count in list(spawns.counts(*spawn_range).items())[:5])
+                    self.log(f"[End] Spawn composition saved ({len(spawns.times)} enemy types, top: {top}): {composition_path}")
+            except Exception as e:
+                self.log(f"[End] Error saving spawn composition: {e}", is_error=True)
+
+        if self.track_fps:
+            try:
+                hitches_path = os.path.join(self.run_output_path, "hitches.csv")
+                pd.DataFrame(self.hitch_log, columns=["Time", "Frametime_ms", "Median_ms"]).to_csv(hitches_path, index=False)
+                worst = max((ms for _, ms, _ in self.hitch_log), default=0)
+                self.log(f"[End] Hitches: {len(self.hitch_log)} (frames over {self.fps_tracker.hitch_threshold:g}x the median, worst {worst:.0f} ms): {hitches_path}")
+            except Exception as e:
+                self.log(f"[End] Error saving hitches: {e}", is_error=True)
+
+        if self.track_credits or (self.track_kills and not self.track_logs):
+            for line in self.scan_reader.summary(labels=self.track_credits):
+                self.log(f"[End] {line}")
+            self.scan_reader.digit_recognizer.save()
+
         if self.log_file:
             self.log("-" * 40)
             self.log("Run ended.")
@@ -1872,6 +1904,10 @@ class WarframeTracker(QtCore.QObject):
                 axes[idx].plot(self.plot_data_fps["t"], self.plot_data_fps["y"], 'k-', label='FPS')
                 if self.pb_data is not None and 'FPS' in self.pb_data:
                     axes[idx].plot(self.pb_data['Time_Min'], self.pb_data['FPS'], 'k--', alpha=0.6, label=pb_label)
+                if self.hitch_log:
+                    # Each hitch at the frame rate of its own frame
+                    axes[idx].plot([t / 60 for t, _, _ in self.hitch_log], [1000.0 / ms for _, ms, _ in self.hitch_log],
+                                   'rx', label=f'Hitches ({len(self.hitch_log)})')
                 axes[idx].set_title('Frames Per Second')
                 axes[idx].set_ylabel('FPS')
                 axes[idx].set_xlabel('Time (min)')
@@ -1912,6 +1948,32 @@ class WarframeTracker(QtCore.QObject):
                 plt.savefig(enemy_plot_path)
                 print(f"[End] Enemy plots saved to: {enemy_plot_path}") # Keep print
                 plt.close(fig_enemy)
+
+            # Spawn Composition (spawns per minute by enemy type, with CPM for comparison)
+            if spawn_range:
+                offsets, series = self.log_reader.spawns.binned(*spawn_range)
+                minutes = [o / 60 for o in offsets]
+                names = list(series)[:8]
+                stacks = [series[n] for n in names]
+                if len(series) > len(names):
+                    names.append("Other")
+                    stacks.append([sum(c) for c in zip(*(series[n] for n in list(series)[8:]))])
+                fig_spawn, ax_spawn = plt.subplots(1, 1, figsize=(10, 6), constrained_layout=True)
+                ax_spawn.stackplot(minutes, *stacks, labels=names, step='post', alpha=0.8)
+                ax_spawn.set_title('Spawn Composition')
+                ax_spawn.set_ylabel('Spawns per minute')
+                ax_spawn.set_xlabel('Time (min)')
+                ax_spawn.grid(True)
+                ax_spawn.legend(loc='upper left', fontsize='small')
+                if self.track_credits and self.cpm:
+                    ax_cpm = ax_spawn.twinx()
+                    ax_cpm.plot(self.time_credits, self.cpm, 'yo-', label='CPM')
+                    ax_cpm.set_ylabel('CPM')
+                    ax_cpm.legend(loc='upper right')
+                spawn_plot_path = os.path.join(self.run_output_path, "spawn_composition.png")
+                plt.savefig(spawn_plot_path)
+                print(f"[End] Spawn composition plot saved to: {spawn_plot_path}") # Keep print
+                plt.close(fig_spawn)
                 
         except Exception as e:
             print(f"[End] Error generating plots: {e}")